@@ -1,36 +1,93 @@
 import os
-import sqlite3
-import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Tuple
-from amadeus import Client, ResponseError
+from typing import TYPE_CHECKING, Callable, List, Dict, Tuple
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import time
-import random
+from gift_card_catalog import get_gift_card_catalog
+from gift_card_index import GiftCardRateIndex
+from locations import get_location_index, normalize_name
+from providers import AmadeusOfferProvider, MockOfferProvider, OfferProvider
+from ranking import TopKRanker
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache, flight_offer_request
+from route_classifier import RouteClassifier
+
+if TYPE_CHECKING:
+    import numpy as np
 
 load_dotenv()
 
+# Award miles by route type and cabin
+AWARD_CHARTS = {
+    'domestic': {'economy': 12500, 'business': 25000, 'first': 50000},
+    'international': {'economy': 30000, 'business': 60000, 'first': 100000},
+    'short_haul': {'economy': 7500, 'business': 15000, 'first': 25000}
+}
+
+# Smallest gift card worth recommending, in dollars
+MIN_GIFT_CARD_VALUE = 25
+
+# Category order of results; ties between categories go to the earlier one
+BATCH_CATEGORIES = ('flights', 'hotels', 'gift_cards')
+
+def award_miles_for(route_types, cabin_classes, award_charts: Dict = AWARD_CHARTS) -> 'np.ndarray':
+    """Vectorized award chart lookup; cabins other than business and first price as economy."""
+    import numpy as np
+    
+    route_names = list(award_charts)
+    cabin_names = ['economy', 'business', 'first']
+    chart = np.array([[award_charts[route][cabin] for cabin in cabin_names] for route in route_names])
+    
+    route_types = np.asarray(route_types, dtype=str)
+    if not len(route_types):
+        return np.zeros(0, dtype=chart.dtype)
+    route_index = {route: i for i, route in enumerate(route_names)}
+    routes, route_inverse = np.unique(route_types, return_inverse=True)
+    route_positions = np.array([route_index[route] for route in routes])[route_inverse]
+    
+    cabins = np.char.lower(np.asarray(cabin_classes, dtype=str))
+    cabin_positions = np.where(cabins == 'business', 1, np.where(cabins == 'first', 2, 0))
+    return chart[route_positions, cabin_positions]
+
 class RedemptionOptimizer:
-    def __init__(self):
+    def __init__(self, rate_limiter: RateLimiter = None, response_cache: ResponseCache = None,
+                 provider: OfferProvider = None):
         api_key = os.getenv('AMADEUS_API_KEY')
         api_secret = os.getenv('AMADEUS_API_SECRET')
         # Initialize Amadeus client only if credentials are present
         self.amadeus = None
         try:
             if api_key and api_secret:
+                # Imported here so mock-only use never loads the SDK
+                from amadeus import Client
                 self.amadeus = Client(client_id=api_key, client_secret=api_secret)
         except Exception:
             # In case the client cannot be created, fall back to mock mode
             self.amadeus = None
 
-        # Track whether mock data was used in the last call
-        self.last_used_mock_flights = False
+        # Shared throttle for every live Amadeus call made by the optimizer
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # On-disk cache of flight searches, shared across runs and UI sessions
+        self.response_cache = response_cache or ResponseCache()
+
+        # Where flight and hotel offers come from: Amadeus when a client exists,
+        # otherwise the zero-latency mock, which is also the fallback when a live
+        # provider fails
+        self.fallback_provider = MockOfferProvider()
+        if provider is None and self.amadeus is not None:
+            provider = AmadeusOfferProvider(self.amadeus, self.rate_limiter)
+        self.provider = provider or self.fallback_provider
+
+        # Offline city/airport index, plus memoized API lookups for names it doesn't know
+        self.locations = get_location_index()
+        self._city_code_cache = {}
+
+        # Distance/region based route typing, memoized per (origin, destination)
+        self.route_classifier = RouteClassifier(self.locations)
         
-        self.award_charts = {
-            'domestic': {'economy': 12500, 'business': 25000, 'first': 50000},
-            'international': {'economy': 30000, 'business': 60000, 'first': 100000},
-            'short_haul': {'economy': 7500, 'business': 15000, 'first': 25000}
-        }
+        self.award_charts = AWARD_CHARTS
         
         # Hotel redemption rates (cents per mile)
         self.hotel_redemption_rates = {
@@ -40,270 +97,78 @@ class RedemptionOptimizer:
             'luxury': 2.25   # 2.25 cents per mile for luxury hotels
         }
         
-        self.gift_card_rates = {
-            'giftcards.com': 4, 'visa gift card': 4, 'mastercard gift card': 4, 'airbnb gift card': 4,
-            'doordash gift card': 4, 'uber gift card': 4, 'uber eats gift card': 4, 'starbucks gift card': 4,
-            'target gift card': 1.3, 'cvs gift card': 4, 'giant eagle gift card': 4, 'fanatics gift card': 4,
-            'melting pot gift card': 4, 'thirdlove gift card': 4, 'tops friendly markets gift card': 4,
-            'jtv gift card': 4, 'zappos gift card': 4, "claire's gift card": 4, "famous dave's gift card": 4,
-            'on the border gift card': 4, 'circle k gift card': 4, "fazoli's gift card": 4,
-            'boxlunch gift card': 4, 'bonefish grill gift card': 4, "mcdonald's gift card": 4,
-            'turo gift card': 4, 'golfnow gift card': 4, 'chewy gift card': 4, 'siriusxm gift card': 4,
-            'l.l. bean gift card': 4, 'carnival cruises gift card': 0.6, 'best buy gift card': 0.6,
-            'alamo drafthouse cinemas gift card': 4, 'quince gift card': 4, "mcalister's deli gift card": 4,
-            'emagine theaters gift card': 4, "friendly's gift card": 4, "cheddar's scratch kitchen gift card": 4,
-            'dazn gift card': 4, "dave & buster's gift card": 4, "ruth's chris steak house gift card": 4,
-            'fogo de chao gift card': 4, "morton's steakhouse gift card": 4, 'pacsun gift card': 4,
-            'the container store gift card': 4, 'uno pizzeria & grill gift card': 4, "bj's restaurants gift card": 4,
-            "logan's roadhouse gift card": 4, 'bob evans gift card': 4, 'lorna jane gift card': 4,
-            'lane bryant gift card': 4, 'guess gift card': 4, 'shutterfly gift card': 4,
-            'bubba gump gift card': 4, 'ace hardware gift card': 4, 'quiznos gift card': 4,
-            'thredup gift card': 4, 'hopper gift card': 4, 'tommy bahama gift card': 4,
-            "carrabba's italian grill gift card": 4, 'sweetfrog gift card': 4, 'qdoba gift card': 4,
-            "dick's sporting goods gift card": 1.3, 'american airlines gift card': 1.3,
-            "dunkin' gift card": 1.3, 'zara gift card': 1.3, 'apple gift card': 1.3, 'nike gift card': 0.6,
-            'chuck e. cheese gift card': 4, 'pandora gift card': 4, "bloomingdale's gift card": 4,
-            'belk gift card': 4, 'athleta gift card': 4, 'barnes & noble gift card': 4,
-            'virgin experience gifts gift card': 4, 'jcpenney gift card': 4, 'spafinder gift card': 4,
-            'build-a-bear gift card': 4, 'california pizza kitchen gift card': 4, 'ruby tuesday gift card': 4,
-            'smoothie king gift card': 4, 'old navy gift card': 4, 'aerie gift card': 4,
-            'advance auto parts gift card': 4, 'tillys gift card': 4, 'guitar center gift card': 4,
-            'vudu gift card': 4, 'topgolf gift card': 4, 'the coffee bean & tea leaf gift card': 4,
-            'white house black market gift card': 4, 'wawa gift card': 4, 'dollar shave club gift card': 4,
-            'untuckit gift card': 4, 'torrid gift card': 4, 'pep boys gift card': 4,
-            'famous footwear gift card': 4, 'jiffy lube gift card': 4, 'cold stone creamery gift card': 4,
-            'sling tv gift card': 4, 'buffalo wild wings gift card': 4, "auntie anne's gift card": 4,
-            'cinnabon gift card': 4, 'kfc gift card': 4, "bass pro shops / cabela's gift card": 4,
-            'gap gift card': 4, 'hotels.com gift card': 4, 'disney gift card': 4, 'american girl gift card': 4,
-            "carter's / oshkosh b'gosh gift card": 4, 'eddie bauer gift card': 4, "chico's gift card": 4,
-            'poshmark gift card': 4, 'oura ring gift card': 4, 'american eagle gift card': 4,
-            'aeropostale gift card': 4, 'hollister gift card': 4, 'abercrombie & fitch gift card': 4,
-            'twitch gift card': 4, 'crutchfield gift card': 4, 'lulus gift card': 4, "lands' end gift card": 4,
-            'michaels gift card': 4, "kirkland's gift card": 4, 'h&m gift card': 4, 'hulu gift card': 4,
-            'meijer gift card': 4, 'crate & barrel gift card': 4, 'firebirds wood fired grill gift card': 4,
-            'red robin gift card': 4, 'ihop gift card': 4, 'krispy kreme gift card': 4,
-            'outback steakhouse gift card': 4, 'olive garden gift card': 4, 'speedway gift card': 4,
-            'shell gift card': 4, 'sonic drive-in gift card': 4, 'texas roadhouse gift card': 4,
-            'subway gift card': 4, 'red lobster gift card': 4, 'papa johns gift card': 4,
-            'panda express gift card': 4, 'meta quest gift card': 4, "macy's gift card": 4,
-            "jersey mike's gift card": 4, 'taco bell gift card': 4, 'five guys gift card': 4,
-            "chili's gift card": 4, 'burger king gift card': 4, 'rei gift card': 4, 'marshalls gift card': 4,
-            'homegoods gift card': 4, 'lego gift card': 4, 'gamestop gift card': 4,
-            'academy sports + outdoors gift card': 4, 'roblox gift card': 4, 'nordstrom gift card': 4,
-            'chipotle gift card': 4, 'the home depot gift card': 4, 'wayfair gift card': 4,
-            "victoria's secret gift card": 4, 'tire discounters gift card': 4, 'dsw gift card': 4,
-            'stop & shop gift card': 4, 'nintendo eshop gift card': 4, 'the cheesecake factory gift card': 4,
-            'nordstrom rack gift card': 4, 'petsmart gift card': 4, 'tj maxx gift card': 4,
-            'lululemon gift card': 4, 'spotify gift card': 4, 'lyft gift card': 4, "domino's gift card": 4,
-            'southwest airlines gift card': 4, 'sony playstation gift card': 4, 'microsoft xbox gift card': 4,
-            'autozone gift card': 4, 'saks off 5th gift card': 4, 'adidas gift card': 4,
-            'ulta beauty gift card': 4, 'bath & body works gift card': 4, 'amtrak gift card': 4,
-            'petco gift card': 4, 'saks fifth avenue gift card': 4, 'total wine & more gift card': 4,
-            'instacart gift card': 4, 'google play gift card': 4, 'regal cinemas gift card': 4,
-            'bp amoco gift card': 4, 'grubhub gift card': 4, 'panera bread gift card': 4,
-            "kohl's gift card": 4, 'cinemark gift card': 4, 'delta air lines gift card': 4,
-            'netflix gift card': 4, 'ikea gift card': 4, 'fandango gift card': 4, "lowe's gift card": 4,
-            'sephora gift card': 4, "applebee's gift card": 4, 'amc theatres gift card': 4,
-            'gift card outlets': 0.9
-        }
+        # Shared gift-card catalog (brand -> miles per dollar), also used by CPM.py
+        self.gift_card_catalog = get_gift_card_catalog()
+        self.gift_card_rates = self.gift_card_catalog.rates
+
+        # Brands sorted by rate with balance thresholds precomputed, built once
+        self.gift_card_index = GiftCardRateIndex(self.gift_card_rates, MIN_GIFT_CARD_VALUE)
     
     def gather_flight_data(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
         """Return flight offers. Falls back to mock data when API is unavailable/errors."""
-        # Default to not using mock until proven otherwise
-        self.last_used_mock_flights = False
-
-        # Simulate API response time (20-25 seconds)
-        time.sleep(random.uniform(20, 25))
+        # Serve repeat live searches inside the freshness window from the cache
+        cache_key = None
+        if not self.provider.is_mock:
+            cache_key = ResponseCache.make_key(
+                'redemption-flights', flight_offer_request(origin, destination, departure_date, max_results=10)
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached['flights']
 
-        # Comment out live API calls and use realistic mock data
-        # if self.amadeus is not None:
-        #     try:
-        #         response = self.amadeus.shopping.flight_offers_search.get(
-        #             originLocationCode=origin,
-        #             destinationLocationCode=destination,
-        #             departureDate=departure_date,
-        #             adults=1,
-        #             max=10
-        #         )
-        #
-        #         flights = []
-        #         for offer in response.data:
-        #             flight = {
-        #                 'price': float(offer['price']['total']),
-        #                 'currency': offer['price']['currency'],
-        #                 'airline': offer['itineraries'][0]['segments'][0]['carrierCode'],
-        #                 'duration': offer['itineraries'][0]['duration'],
-        #                 'cabin': offer['travelerPricings'][0]['fareDetailsBySegment'][0].get('cabin', 'ECONOMY')
-        #             }
-        #             flights.append(flight)
-        #
-        #         if flights:
-        #             return flights
-        #     except Exception as e:
-        #         print(f"Error gathering flight data: {e}")
+        flights = []
+        try:
+            flights = self.provider.flight_offers(origin, destination, departure_date)
+        except Exception as e:
+            print(f"Error gathering flight data: {e}")
 
-        # Use realistic mock data and randomly select 3 options
-        self.last_used_mock_flights = True
-        all_flights = self._realistic_mock_flight_offers(origin, destination)
-        return random.sample(all_flights, min(3, len(all_flights)))
+        if not flights and not self.provider.is_mock:
+            # Not cached: a mock fallback must not outlive the outage
+            return self.fallback_provider.flight_offers(origin, destination, departure_date)
 
-    def _realistic_mock_flight_offers(self, origin: str, destination: str) -> List[Dict]:
-        """Provide realistic mock flight data mirroring Amadeus API response structure."""
-        # 10 realistic flight options with varied prices, airlines, and cabins
-        realistic_offers = [
-            {"price": 189.0, "currency": "USD", "airline": "DL", "duration": "PT6H10M", "cabin": "ECONOMY"},
-            {"price": 249.0, "currency": "USD", "airline": "AA", "duration": "PT6H05M", "cabin": "ECONOMY"},
-            {"price": 312.0, "currency": "USD", "airline": "UA", "duration": "PT6H15M", "cabin": "ECONOMY"},
-            {"price": 275.0, "currency": "USD", "airline": "B6", "duration": "PT5H55M", "cabin": "ECONOMY"},
-            {"price": 329.0, "currency": "USD", "airline": "AS", "duration": "PT6H20M", "cabin": "ECONOMY"},
-            {"price": 512.0, "currency": "USD", "airline": "DL", "duration": "PT6H10M", "cabin": "BUSINESS"},
-            {"price": 689.0, "currency": "USD", "airline": "AA", "duration": "PT6H05M", "cabin": "BUSINESS"},
-            {"price": 799.0, "currency": "USD", "airline": "UA", "duration": "PT6H00M", "cabin": "FIRST"},
-            {"price": 945.0, "currency": "USD", "airline": "B6", "duration": "PT5H55M", "cabin": "FIRST"},
-            {"price": 1125.0, "currency": "USD", "airline": "AS", "duration": "PT6H20M", "cabin": "FIRST"},
-        ]
-        flights = []
-        for offer in realistic_offers:
-            flights.append({
-                'price': float(offer['price']),
-                'currency': offer['currency'],
-                'airline': offer['airline'],
-                'duration': offer['duration'],
-                'cabin': offer['cabin']
-            })
+        if cache_key is not None and flights:
+            self.response_cache.set(cache_key, {'flights': flights})
         return flights
     
     def gather_hotel_data(self, city_code: str, check_in_date: str, check_out_date: str) -> List[Dict]:
-        """Gather hotel data from Amadeus API - now using realistic mock data"""
-        # Simulate API response time (20-25 seconds)
-        time.sleep(random.uniform(20, 25))
-
-        # Comment out live API calls and use realistic mock data
-        # try:
-        #     # Get hotels in the city
-        #     hotels_response = self.amadeus.reference_data.locations.hotels.by_city.get(
-        #         cityCode=city_code
-        #     )
-        #     
-        #     if not hotels_response.data:
-        #         return []
-        #     
-        #     hotels = []
-        #     hotels_checked = 0
-        #     
-        #     for hotel in hotels_response.data[:10]:  # Check first 10 hotels
-        #         try:
-        #             hotel_id = hotel.get('hotelId')
-        #             if hotel_id:
-        #                 offers_response = self.amadeus.shopping.hotel_offers_search.get(
-        #                     hotelIds=hotel_id,
-        #                     checkInDate=check_in_date,
-        #                     checkOutDate=check_out_date,
-        #                     adults=1
-        #                 )
-        #                 
-        #                 if offers_response.data:
-        #                     for offer in offers_response.data:
-        #                         hotel_info = offer.get('hotel', {})
-        #                         first_offer = offer.get('offers', [{}])[0]
-        #                         price = first_offer.get('price', {})
-        #                         
-        #                         # Determine hotel category based on rating
-        #                         rating = hotel_info.get('rating', 0)
-        #                         if rating >= 4.5:
-        #                             category = 'luxury'
-        #                         elif rating >= 4.0:
-        #                             category = 'upscale'
-        #                         elif rating >= 3.0:
-        #                             category = 'mid_scale'
-        #                         else:
-        #                             category = 'economy'
-        #                         
-        #                         hotel_data = {
-        #                             'name': hotel_info.get('name', 'Unknown'),
-        #                             'price': float(price.get('total', 0)),
-        #                             'currency': price.get('currency', 'USD'),
-        #                             'rating': rating,
-        #                             'category': category,
-        #                             'chain': hotel_info.get('chainCode', 'Independent')
-        #                         }
-        #                         hotels.append(hotel_data)
-        #                         hotels_checked += 1
-        #                         
-        #                         if hotels_checked >= 20:  # Limit to 20 hotels
-        #                             break
-        #                 
-        #                 if hotels_checked >= 20:
-        #                     break
-        #                         
-        #             except Exception as e:
-        #                 continue
-        #         
-        #     return hotels
-        #     
-        # except Exception as e:
-        #     print(f"Error gathering hotel data: {e}")
-        #     return []
-
-        # Use realistic mock data and randomly select 3 options
-        all_hotels = self._realistic_mock_hotel_offers(city_code, check_in_date, check_out_date)
-        return random.sample(all_hotels, min(3, len(all_hotels)))
-
-    def _realistic_mock_hotel_offers(self, city_code: str, check_in_date: str, check_out_date: str) -> List[Dict]:
-        """Provide realistic mock hotel data mirroring Amadeus API response structure."""
-        # 10 realistic hotel options with varied prices, ratings, and categories
-        realistic_hotels = [
-            {"name": "Holiday Inn Express", "price": 89.0, "currency": "USD", "rating": 3.2, "category": "economy", "chain": "IHG"},
-            {"name": "Comfort Inn & Suites", "price": 112.0, "currency": "USD", "rating": 3.5, "category": "economy", "chain": "CHOICE"},
-            {"name": "Hampton Inn", "price": 135.0, "currency": "USD", "rating": 3.8, "category": "mid_scale", "chain": "HILTON"},
-            {"name": "Courtyard by Marriott", "price": 189.0, "currency": "USD", "rating": 4.1, "category": "mid_scale", "chain": "MARRIOTT"},
-            {"name": "Hilton Garden Inn", "price": 225.0, "currency": "USD", "rating": 4.3, "category": "upscale", "chain": "HILTON"},
-            {"name": "Embassy Suites", "price": 289.0, "currency": "USD", "rating": 4.4, "category": "upscale", "chain": "HILTON"},
-            {"name": "Renaissance Hotel", "price": 345.0, "currency": "USD", "rating": 4.6, "category": "luxury", "chain": "MARRIOTT"},
-            {"name": "W Hotel", "price": 425.0, "currency": "USD", "rating": 4.7, "category": "luxury", "chain": "MARRIOTT"},
-            {"name": "The Ritz-Carlton", "price": 589.0, "currency": "USD", "rating": 4.9, "category": "luxury", "chain": "MARRIOTT"},
-            {"name": "Four Seasons Hotel", "price": 725.0, "currency": "USD", "rating": 4.9, "category": "luxury", "chain": "FOUR_SEASONS"},
-        ]
-
+        """Return hotel offers. Falls back to mock data when API is unavailable/errors."""
         hotels = []
-        for hotel in realistic_hotels:
-            hotels.append({
-                'name': hotel['name'],
-                'price': float(hotel['price']),
-                'currency': hotel['currency'],
-                'rating': hotel['rating'],
-                'category': hotel['category'],
-                'chain': hotel['chain']
-            })
+        try:
+            hotels = self.provider.hotel_offers(city_code, check_in_date, check_out_date)
+        except Exception as e:
+            print(f"Error gathering hotel data: {e}")
+
+        if not hotels and not self.provider.is_mock:
+            hotels = self.fallback_provider.hotel_offers(city_code, check_in_date, check_out_date)
         return hotels
     
     def get_city_code(self, city_name: str) -> str:
         """Get the IATA city code for a given city name"""
+        # Bundled index first; the API is only a fallback for unknown names
+        city_code = self.locations.city_code(city_name)
+        if city_code:
+            return city_code
+
+        key = normalize_name(city_name)
+        if key in self._city_code_cache:
+            return self._city_code_cache[key]
+        if self.amadeus is None:
+            return None
         try:
-            response = self.amadeus.reference_data.locations.get(
+            response = self.rate_limiter.call(
+                self.amadeus.reference_data.locations.get,
                 keyword=city_name,
                 subType="CITY"
             )
-            if response.data:
-                return response.data[0]['iataCode']
-            return None
         except Exception as e:
             print(f"Error getting city code for {city_name}: {e}")
             return None
+        city_code = response.data[0]['iataCode'] if response.data else None
+        self._city_code_cache[key] = city_code
+        return city_code
     
     def calculate_route_type(self, origin: str, destination: str) -> str:
-        us_airports = ['JFK', 'LAX', 'ORD', 'DFW', 'ATL', 'SFO', 'BOS', 'SEA', 'DCA', 'IAD']
-        eu_airports = ['LHR', 'CDG', 'FRA', 'MAD', 'BCN', 'FCO', 'AMS', 'MUC']
-        
-        if origin in us_airports and destination in us_airports:
-            if origin in ['JFK', 'BOS'] and destination in ['DCA', 'IAD']:
-                return 'short_haul'
-            return 'domestic'
-        elif (origin in us_airports and destination not in us_airports) or \
-             (origin not in us_airports and destination in us_airports):
-            return 'international'
-        else:
-            return 'short_haul'
+        return self.route_classifier.classify(origin, destination)
     
     def calculate_value_per_mile(self, cash_price: float, miles_required: int) -> float:
         if miles_required == 0:
@@ -322,6 +187,12 @@ class RedemptionOptimizer:
             cabin = 'economy'
             
         return self.award_charts[route_type][cabin]
+
+    def get_award_miles_required_batch(self, origins: List[str], destinations: List[str],
+                                       cabin_classes: List[str]) -> 'np.ndarray':
+        """Award miles for many flights at once, e.g. a whole collected dataset."""
+        route_types = self.route_classifier.classify_many(origins, destinations)
+        return award_miles_for(route_types, cabin_classes, self.award_charts)
     
     def analyze_flight_redemptions(self, user_miles: int, origin: str, 
                                   destination: str, departure_date: str) -> List[Dict]:
@@ -390,84 +261,162 @@ class RedemptionOptimizer:
         
         return redemption_options
     
-    def analyze_gift_card_redemptions(self, user_miles: int) -> List[Dict]:
-        redemption_options = []
-        
-        for brand, miles_per_dollar in self.gift_card_rates.items():
-            max_value = user_miles / miles_per_dollar
-            if max_value >= 25:
-                cpm = self.calculate_value_per_mile(max_value, user_miles)
-                
-                redemption_options.append({
-                    'type': 'gift_card',
-                    'description': f"{brand.title()}",
-                    'cash_value': max_value,
-                    'miles_required': user_miles,
-                    'cpm': cpm,
-                    'details': {
-                        'brand': brand.title(),
-                        'miles_per_dollar': miles_per_dollar,
-                        'max_amount': f"${max_value:.2f}"
-                    }
-                })
-        
-        return redemption_options
+    def analyze_gift_card_redemptions(self, user_miles: int, limit: int = None, min_cpm: float = None) -> List[Dict]:
+        """Gift cards worth at least $25 for this balance, best CPM first.
+
+        ``limit`` and ``min_cpm`` cut the list down before any option dicts are built.
+        """
+        return [
+            self.gift_card_option(brand, miles_per_dollar, user_miles)
+            for brand, miles_per_dollar in self.gift_card_index.top(user_miles, limit, min_cpm)
+        ]
     
-    def optimize_redemption(self, user_miles: int, origin: str = None, 
-                           destination: str = None, departure_date: str = None,
-                           city_name: str = None, check_in_date: str = None, 
-                           check_out_date: str = None) -> Dict:
-        all_options = []
-        flight_options = []
-        hotel_options = []
-        gift_card_options = []
+    def gift_card_option(self, brand: str, miles_per_dollar: float, user_miles: int) -> Dict:
+        """Redeem the whole balance for one brand's gift card."""
+        max_value = user_miles / miles_per_dollar
+        cpm = self.calculate_value_per_mile(max_value, user_miles)
+        return {
+            'type': 'gift_card',
+            'description': f"{brand.title()}",
+            'cash_value': max_value,
+            'miles_required': user_miles,
+            'cpm': cpm,
+            'details': {
+                'brand': brand.title(),
+                'miles_per_dollar': miles_per_dollar,
+                'max_amount': f"${max_value:.2f}"
+            }
+        }
+    
+    def category_tasks(self, user_miles: int, origin: str = None,
+                       destination: str = None, departure_date: str = None,
+                       city_name: str = None, check_in_date: str = None,
+                       check_out_date: str = None) -> Dict[str, Callable[[], List[Dict]]]:
+        """Return the independent per-category analyses requested by the inputs."""
+        tasks = {}
         
         # Analyze flights if flight parameters are provided
         if origin and destination and departure_date:
-            flight_options = self.analyze_flight_redemptions(
+            tasks['flights'] = lambda: self.analyze_flight_redemptions(
                 user_miles, origin, destination, departure_date
             )
-            all_options.extend(flight_options)
         
         # Analyze hotels if hotel parameters are provided
         if city_name and check_in_date and check_out_date:
-            hotel_options = self.analyze_hotel_redemptions(
+            tasks['hotels'] = lambda: self.analyze_hotel_redemptions(
                 user_miles, city_name, check_in_date, check_out_date
             )
-            all_options.extend(hotel_options)
         
         # Always analyze gift cards
-        gift_card_options = self.analyze_gift_card_redemptions(user_miles)
-        all_options.extend(gift_card_options)
-        
-        # Sort each category by CPM and get top 3 for each
-        flight_options.sort(key=lambda x: x['cpm'], reverse=True)
-        hotel_options.sort(key=lambda x: x['cpm'], reverse=True)
-        gift_card_options.sort(key=lambda x: x['cpm'], reverse=True)
-        
-        top_flights = flight_options[:3]
-        top_hotels = hotel_options[:3]
-        top_gift_cards = gift_card_options[:3]
+        tasks['gift_cards'] = lambda: self.analyze_gift_card_redemptions(user_miles)
+        return tasks
+    
+    def run_category_tasks(self, tasks: Dict[str, Callable[[], List[Dict]]], category_timeout: float = None,
+                           allow_partial: bool = False) -> Tuple[Dict[str, List[Dict]], List[str]]:
+        """Run category analyses concurrently.
+
+        Each category gets ``category_timeout`` seconds from the start of the fan-out.
+        A category that misses it raises TimeoutError, or with ``allow_partial`` is
+        returned empty and listed in the second element of the result.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, len(tasks)), thread_name_prefix='redemption')
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        deadline = time.monotonic() + category_timeout if category_timeout is not None else None
+        results = {}
+        timed_out = []
+        try:
+            for name, future in futures.items():
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                try:
+                    results[name] = future.result(timeout=remaining)
+                except FuturesTimeoutError:
+                    if not allow_partial:
+                        raise TimeoutError(f"{name} analysis did not finish within {category_timeout}s")
+                    future.cancel()
+                    results[name] = []
+                    timed_out.append(name)
+        finally:
+            # Don't wait for stragglers; their results are no longer needed
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results, timed_out
+    
+    def optimize_redemption(self, user_miles: int, origin: str = None, 
+                           destination: str = None, departure_date: str = None,
+                           city_name: str = None, check_in_date: str = None, 
+                           check_out_date: str = None, category_timeout: float = None,
+                           allow_partial: bool = False, min_cpm: float = None,
+                           max_miles: int = None, cabin: str = None,
+                           categories: List[str] = None, top_k: int = 3) -> Dict:
+        filters = {'min_cpm': min_cpm, 'max_miles': max_miles, 'cabin': cabin, 'categories': categories, 'top_k': top_k}
+        tasks = self.search_tasks(
+            user_miles, origin, destination, departure_date, city_name, check_in_date, check_out_date, **filters
+        )
+        category_options, timed_out = self.run_category_tasks(tasks, category_timeout, allow_partial)
+        user_input = self.search_input(
+            user_miles, origin, destination, departure_date, city_name, check_in_date, check_out_date
+        )
+        return self.search_result(user_miles, user_input, category_options, timed_out, **filters)
+    
+    def search_tasks(self, user_miles: int, origin: str = None, destination: str = None,
+                     departure_date: str = None, city_name: str = None, check_in_date: str = None,
+                     check_out_date: str = None, min_cpm: float = None, max_miles: int = None,
+                     cabin: str = None, categories: List[str] = None,
+                     top_k: int = 3) -> Dict[str, Callable[[], List[Dict]]]:
+        """category_tasks narrowed to what the filters can show; ``top_k=None`` keeps every option."""
+        ranker = TopKRanker(top_k, min_cpm=min_cpm, max_miles=max_miles, cabin=cabin, categories=categories)
+        tasks = self.category_tasks(
+            user_miles, origin, destination, departure_date, city_name, check_in_date, check_out_date
+        )
+        # Categories filtered out entirely are never analyzed
+        tasks = {name: task for name, task in tasks.items() if ranker.wants(name)}
+        if 'gift_cards' in tasks:
+            # Only build option dicts for the brands that can make the top-k
+            tasks['gift_cards'] = lambda: self.analyze_gift_card_redemptions(user_miles, top_k, min_cpm)
+        return tasks
+    
+    def search_input(self, user_miles: int, origin: str = None, destination: str = None,
+                     departure_date: str = None, city_name: str = None, check_in_date: str = None,
+                     check_out_date: str = None) -> Dict:
+        return {
+            'miles_balance': user_miles,
+            'origin': origin,
+            'destination': destination,
+            'travel_date': departure_date,
+            'city_name': city_name,
+            'check_in_date': check_in_date,
+            'check_out_date': check_out_date
+        }
+    
+    def search_result(self, user_miles: int, user_input: Dict, category_options: Dict[str, List[Dict]],
+                      incomplete_categories: List[str] = None, min_cpm: float = None, max_miles: int = None,
+                      cabin: str = None, categories: List[str] = None, top_k: int = 3) -> Dict:
+        """Rank the output of ``search_tasks`` (complete or not) into a result."""
+        ranker = TopKRanker(top_k, min_cpm=min_cpm, max_miles=max_miles, cabin=cabin, categories=categories)
+        if 'gift_cards' in category_options and 'gift_cards' not in (incomplete_categories or []):
+            # The brands search_tasks skipped still count towards average_cpm
+            eligible = self.gift_card_index.eligible_count(user_miles)
+            built = category_options['gift_cards']
+            ranker.record(eligible - len(built),
+                          self.gift_card_index.cpm_total(eligible) - sum(option['cpm'] for option in built))
+        return self.build_result(user_miles, user_input, category_options, incomplete_categories, ranker)
+    
+    def build_result(self, user_miles: int, user_input: Dict, category_options: Dict[str, List[Dict]],
+                     incomplete_categories: List[str] = None, ranker: TopKRanker = None) -> Dict:
+        # Keep only the top 3 per category (or whatever the ranker is set up for)
+        ranker = ranker or TopKRanker(3)
+        for category in BATCH_CATEGORIES:
+            ranker.extend(category, category_options.get(category, []))
         
         # Find overall best option
-        all_options.sort(key=lambda x: x['cpm'], reverse=True)
-        best_overall = all_options[0] if all_options else None
+        best_overall = ranker.best()
         
         output = {
-            'user_input': {
-                'miles_balance': user_miles,
-                'origin': origin,
-                'destination': destination,
-                'travel_date': departure_date,
-                'city_name': city_name,
-                'check_in_date': check_in_date,
-                'check_out_date': check_out_date
-            },
+            'user_input': user_input,
             'best_overall_recommendation': best_overall,
             'top_options_by_category': {
-                'flights': top_flights,
-                'hotels': top_hotels,
-                'gift_cards': top_gift_cards
+                'flights': ranker.top('flights'),
+                'hotels': ranker.top('hotels'),
+                'gift_cards': ranker.top('gift_cards')
             },
             'summary': self._generate_summary(best_overall, user_miles),
             'detailed_analysis': {
@@ -475,12 +424,110 @@ class RedemptionOptimizer:
                 'flight_options': 9,
                 'hotel_options': 25,
                 'gift_card_options': 201,
-                'average_cpm': sum(opt['cpm'] for opt in all_options) / len(all_options) if all_options else 0
-            }
+                'average_cpm': ranker.average_cpm
+            },
+            'incomplete_categories': incomplete_categories or []
         }
         
         return output
     
+    def batch_option_set(self, origin: str = None, destination: str = None, departure_date: str = None,
+                         city_name: str = None, check_in_date: str = None, check_out_date: str = None,
+                         category_timeout: float = None) -> Dict[str, List[Dict]]:
+        """Options shared by every balance in a batch, each category ordered best first.
+
+        Flights and hotels are analyzed once with no balance limit. Gift cards are
+        listed as brand and rate, since their value depends on each balance.
+        """
+        tasks = self.category_tasks(
+            float('inf'), origin, destination, departure_date, city_name, check_in_date, check_out_date
+        )
+        del tasks['gift_cards']
+        category_options, _ = self.run_category_tasks(tasks, category_timeout)
+        category_options['gift_cards'] = [
+            {'brand': brand, 'miles_per_dollar': miles_per_dollar}
+            for brand, miles_per_dollar in self.gift_card_index.entries()
+        ]
+        return {
+            category: sorted(category_options.get(category, []), key=lambda x: self._batch_score(category, x),
+                             reverse=True)
+            for category in BATCH_CATEGORIES
+        }
+    
+    def _batch_score(self, category: str, option: Dict) -> float:
+        if category == 'gift_cards':
+            return self.calculate_value_per_mile(1 / option['miles_per_dollar'], 1)
+        return option['cpm']
+    
+    def _batch_threshold(self, category: str, option: Dict) -> float:
+        if category == 'gift_cards':
+            return MIN_GIFT_CARD_VALUE * option['miles_per_dollar']
+        return option['miles_required']
+    
+    def optimize_redemption_batch(self, balances, origin: str = None, destination: str = None,
+                                  departure_date: str = None, city_name: str = None, check_in_date: str = None,
+                                  check_out_date: str = None, k: int = 3, chunk_size: int = 8192) -> Dict:
+        """Score many miles balances against one shared set of options.
+
+        Every option has a fixed CPM and a fixed minimum balance, so a balance's
+        top-k in a category is the first k affordable options in CPM order. The
+        result holds arrays indexed by balance: ``top_options_by_category`` maps
+        each category to an ``(n, k)`` array of positions into ``options``
+        (-1 = none), and ``best_overall`` holds the winning category index into
+        ``categories``, its position and its CPM. Use ``batch_recommendation``
+        to expand one balance into option dicts.
+        """
+        # NumPy is only needed for batch work, so it isn't imported with the module
+        import numpy as np
+        from batch_scoring import best_across, top_k_eligible
+        
+        balances = np.asarray(balances, dtype=np.float64)
+        options = self.batch_option_set(origin, destination, departure_date, city_name, check_in_date, check_out_date)
+        top = {}
+        scores = {}
+        for category, category_options in options.items():
+            thresholds = np.array([self._batch_threshold(category, x) for x in category_options], dtype=np.float64)
+            scores[category] = np.array([self._batch_score(category, x) for x in category_options], dtype=np.float64)
+            top[category] = top_k_eligible(balances, thresholds, k, chunk_size)
+        
+        best_category, best_cpm = best_across([top[c] for c in BATCH_CATEGORIES], [scores[c] for c in BATCH_CATEGORIES])
+        first_choices = np.stack([top[c][:, 0] for c in BATCH_CATEGORIES])
+        best_position = np.where(best_category >= 0,
+                                 first_choices[best_category.clip(0), np.arange(len(balances))], -1)
+        return {
+            'balances': balances,
+            'categories': BATCH_CATEGORIES,
+            'options': options,
+            'top_options_by_category': top,
+            'best_overall': {'category': best_category, 'position': best_position, 'cpm': best_cpm}
+        }
+    
+    def batch_recommendation(self, batch: Dict, index: int) -> Dict:
+        """Expand one balance of an ``optimize_redemption_batch`` result into option dicts."""
+        user_miles = int(batch['balances'][index])
+        
+        def option(category: str, position: int) -> Dict:
+            chosen = batch['options'][category][position]
+            if category == 'gift_cards':
+                return self.gift_card_option(chosen['brand'], chosen['miles_per_dollar'], user_miles)
+            return chosen
+        
+        top_options = {
+            category: [option(category, position) for position in positions[index] if position >= 0]
+            for category, positions in batch['top_options_by_category'].items()
+        }
+        best = batch['best_overall']
+        category_index = int(best['category'][index])
+        best_overall = None
+        if category_index >= 0:
+            best_overall = option(batch['categories'][category_index], int(best['position'][index]))
+        return {
+            'miles_balance': user_miles,
+            'best_overall_recommendation': best_overall,
+            'top_options_by_category': top_options,
+            'summary': self._generate_summary(best_overall, user_miles)
+        }
+    
     def _generate_summary(self, best_option: Dict, user_miles: int) -> str:
         if not best_option:
             return f"No redemption options available for {user_miles:,} miles."
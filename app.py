@@ -1,13 +1,12 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-import folium
-from streamlit_folium import folium_static
+import streamlit.components.v1 as components
+from bisect import bisect_right
 from datetime import datetime, timedelta
+import hashlib
+import json
 import sys
 import os
+import re
 from textwrap import dedent
 
 # Add the current directory to Python path to import algorithm
@@ -20,6 +19,11 @@ except ImportError:
     st.error("Could not import RedemptionOptimizer. Please ensure algorithm.py is in the same directory.")
     st.stop()
 
+from gift_card_catalog import get_gift_card_catalog
+from response_cache import ResponseCache, TTLCache, redemption_search_request
+from route_classifier import RouteClassifier
+from search_jobs import SearchJob, make_search_executor
+
 # Page configuration
 st.set_page_config(
     page_title="Rove Miles Redemption Optimizer",
@@ -28,193 +32,144 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Set global Plotly theme to dark
-px.defaults.template = "plotly_dark"
-pio.templates.default = "plotly_dark"
+# Stylesheet, read from disk once per process
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'app.css')
+
+@st.cache_resource
+def load_css():
+    """App stylesheet wrapped in a <style> tag"""
+    with open(CSS_PATH, encoding='utf-8') as css_file:
+        return f"<style>\n{css_file.read()}</style>"
+
+# Charting and mapping libraries are imported by the code that draws with them,
+# so startup and the Home/Search/Calculator tabs don't pay for them
+def load_plotly_express():
+    """plotly.express with the app's dark theme as the default"""
+    import plotly.express as px
+    import plotly.io as pio
+    px.defaults.template = "plotly_dark"
+    pio.templates.default = "plotly_dark"
+    return px
 
 # Custom CSS for styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;700&display=swap');
-    :root {
-        --bg: #0b0f15;
-        --panel: #0f172a;
-        --panel-2: #111827;
-        --text: #e5e7eb;
-        --muted: #9ca3af;
-        --accent-1: #7c3aed;
-        --accent-2: #06b6d4;
-        --success: #10b981;
-        --warning: #f59e0b;
-        --danger: #ef4444;
-    }
+st.markdown(load_css(), unsafe_allow_html=True)
 
-    .stApp { background-color: var(--bg) !important; color: var(--text) !important; }
-    .stApp, .stApp * { color: var(--text) !important; font-family: 'Poppins', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, 'Noto Sans', 'Liberation Sans', sans-serif; }
-    .block-container { padding-top: 3rem; }
-
-    /* Remove Streamlit top bar/menu/footer */
-    [data-testid="stHeader"] { display: none; }
-    #MainMenu { visibility: hidden; }
-    footer { visibility: hidden; }
-
-    /* Links - remove default blue underline globally */
-    a, a:visited { color: inherit !important; text-decoration: none !important; }
-    a:hover, a:focus, a:active { text-decoration: none !important; outline: none !important; box-shadow: none !important; }
-
-    /* Inputs - dark theme with animated focus */
-    input[type="text"], input[type="number"], input[type="email"], input[type="password"],
-    textarea, select {
-        background-color: var(--panel-2) !important;
-        color: var(--text) !important;
-        border: 1px solid #374151 !important; /* thin gray */
-        border-radius: 10px !important;
-        padding: 0.55rem 0.75rem !important;
-        transition: border-color .35s ease-in-out, box-shadow .35s ease-in-out, transform .15s ease-in-out;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    input:hover, textarea:hover, select:hover {
-        border-color: #4b5563 !important;
-    }
-    input:focus, textarea:focus, select:focus {
-        border-color: var(--accent-2) !important;
-        box-shadow: 0 0 0 3px rgba(6,182,212,0.18) !important;
-        transform: translateY(-1px);
-    }
-    /* Streamlit number/date/time inputs containers */
-    [data-testid="stNumberInput"] input,
-    [data-testid="stTextInput"] input,
-    [data-testid="stDateInput"] input,
-    [data-testid="stTextArea"] textarea {
-        background-color: var(--panel-2) !important;
-        color: var(--text) !important;
-    }
+# Slowest category we wait for before showing partial results
+CATEGORY_TIMEOUT_SECONDS = 30
 
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0d1117 0%, #0b0f15 100%);
-        color: var(--text);
-        border-right: 1px solid #1f2937;
-    }
-    [data-testid="stSidebar"] * { color: var(--text) !important; }
-
-    /* Header */
-    .main-header {
-        background: radial-gradient(1200px 300px at 10% -20%, rgba(124,58,237,0.35), transparent),
-                    radial-gradient(1200px 300px at 90% -20%, rgba(6,182,212,0.25), transparent),
-                    linear-gradient(90deg, #0b0f15 0%, #0b0f15 100%);
-        padding: 2rem;
-        border-radius: 16px;
-        color: var(--text);
-        text-align: center;
-        margin: 1rem 0 2rem 0;
-        border: 1px solid #1f2937;
-        box-shadow: inset 0 0 0 1px rgba(255,255,255,0.02), 0 10px 30px rgba(0,0,0,0.45);
-        background-size: 140% 140%;
-        animation: headerPulse 14s ease-in-out infinite;
-    }
+# Completed searches are shared across sessions for this long, up to this many
+RESULT_CACHE_TTL_SECONDS = 600
+RESULT_CACHE_MAX_ENTRIES = 256
 
-    .metric-card {
-        background: var(--panel);
-        padding: 1rem;
-        border-radius: 12px;
-        border-left: 4px solid var(--accent-2);
-        box-shadow: 0 10px 24px rgba(0,0,0,0.25);
-        margin: 0.5rem 0;
-        color: var(--text);
-        transition: transform .3s ease-in-out, box-shadow .3s ease-in-out, border-color .3s ease-in-out;
-        animation: fadeInUp .8s ease both;
-    }
-    .metric-card:hover { transform: translateY(-2px); box-shadow: 0 16px 32px rgba(0,0,0,0.35); }
-
-    .option-card {
-        background: var(--panel-2);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 1px solid #1f2937;
-        box-shadow: 0 10px 24px rgba(0,0,0,0.25);
-        margin: 1rem 0;
-        color: var(--text);
-        transition: transform .3s ease-in-out, box-shadow .3s ease-in-out, border-color .3s ease-in-out;
-        animation: fadeInUp .8s ease both;
-    }
-    .option-card:hover { transform: translateY(-3px); box-shadow: 0 18px 36px rgba(0,0,0,0.35); border-color: #263041; }
-
-    .cpm-high { color: var(--success); font-weight: 700; }
-    .cpm-medium { color: var(--warning); font-weight: 700; }
-    .cpm-low { color: var(--danger); font-weight: 700; }
-
-    .stButton > button, .start-btn {
-        background: linear-gradient(90deg, var(--accent-1) 0%, var(--accent-2) 100%);
-        color: white !important;
-        border: none;
-        border-radius: 999px;
-        padding: 0.6rem 1.4rem;
-        font-weight: 700;
-        letter-spacing: 0.2px;
-        text-decoration: none;
-        display: inline-block;
-        transition: transform .25s ease-in-out, filter .25s ease-in-out, box-shadow .35s ease-in-out;
-        box-shadow: 0 8px 20px rgba(124,58,237,0.25), 0 8px 20px rgba(6,182,212,0.15);
-    }
-    .stButton > button:hover, .start-btn:hover { filter: brightness(1.08); transform: translateY(-1px); }
-    .stButton > button:active, .start-btn:active { transform: translateY(0); }
-
-    /* Make only the Search Redemption submit button text black */
-    #search-submit-area .stButton > button { color: #000 !important; }
-
-    /* Tabs accents */
-    button[role="tab"] {
-        color: var(--muted) !important;
-        border-bottom: none !important; /* fully remove underline */
-        border: none !important;
-        box-shadow: none !important;
-        outline: none !important;
-        transition: color .25s ease-in-out;
-    }
-    button[role="tab"][aria-selected="true"] {
-        color: var(--text) !important;
-        border-bottom: none !important;
-        border: none !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    button[role="tab"]:focus, button[role="tab"]:focus-visible { outline: none !important; box-shadow: none !important; }
+# Background searches: how often the page checks on them, and how many category lookups run at once
+SEARCH_POLL_SECONDS = 1.0
+SEARCH_WORKERS = 8
 
-    /* Simple stagger animation */
-    @keyframes fadeInUp {
-        from { opacity: 0; transform: translateY(12px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
+# Search results: each category is one HTML table, paged in the browser
+RESULTS_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'results_table.html')
+RESULTS_TABLE_PLACEHOLDER = re.compile(r'\{\{(OPTIONS_JSON|PAGE_SIZE|MIN_CPM|MAX_MILES)\}\}')
+RESULTS_PAGE_SIZE = 25
+# Every ranked option is sent to the table (None = no cap); the table pages them
+RESULTS_PER_CATEGORY = None
+RESULTS_ROW_PX = 50
+RESULTS_TABLE_CHROME_PX = 130
 
-    /* Header pulse gradient */
-    @keyframes headerPulse {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Analysis charts: built figures kept per process, and the point count above
+# which the scatter is binned and animation is turned off
+CHART_CACHE_MAX_ENTRIES = 64
+CHART_DETAIL_MAX_OPTIONS = 500
+CHART_BINS = 20
+CATEGORY_COLORS = {'Flights': '#06b6d4', 'Hotels': '#7c3aed'}
+
+# Rendered route maps kept per process, and their height on the page
+MAP_CACHE_MAX_ENTRIES = 32
+MAP_HEIGHT = 500
 
 # Initialize session state
-if 'optimizer' not in st.session_state:
-    st.session_state.optimizer = None
 if 'results' not in st.session_state:
     st.session_state.results = None
+if 'search_job' not in st.session_state:
+    st.session_state.search_job = None
+    st.session_state.search_key = None
+    st.session_state.search_filters = {}
 if 'user_feedback' not in st.session_state:
     st.session_state.user_feedback = []
 
+@st.cache_resource
+def get_optimizer():
+    """One RedemptionOptimizer (client, rate limiter, caches) for every session"""
+    return RedemptionOptimizer()
+
+@st.cache_resource
+def get_result_cache():
+    """Process-wide cache of search results, keyed on the normalized search"""
+    return TTLCache(ttl=RESULT_CACHE_TTL_SECONDS, max_entries=RESULT_CACHE_MAX_ENTRIES)
+
 def initialize_optimizer():
     """Initialize the RedemptionOptimizer"""
     try:
-        if st.session_state.optimizer is None:
-            st.session_state.optimizer = RedemptionOptimizer()
-        return st.session_state.optimizer
+        return get_optimizer()
     except Exception as e:
         st.error(f"Error initializing optimizer: {e}")
         return None
 
+@st.cache_resource
+def get_search_executor():
+    """Worker threads shared by the background searches of every session"""
+    return make_search_executor(max_workers=SEARCH_WORKERS)
+
+def start_search(optimizer, **search):
+    """Answer from the shared result cache, or start a background search"""
+    previous = st.session_state.search_job
+    if previous is not None:
+        previous.cancel()
+    st.session_state.search_job = None
+    
+    # The sidebar filters are applied by the search; the results tables show them as their floor
+    st.session_state.search_filters = {'min_cpm': search.get('min_cpm'), 'max_miles': search.get('max_miles')}
+    key = ResponseCache.make_key('redemption-search', redemption_search_request(**search))
+    cached = get_result_cache().get(key)
+    if cached is not None:
+        st.session_state.results = cached
+        return
+    st.session_state.results = None
+    st.session_state.search_key = key
+    st.session_state.search_job = SearchJob(
+        optimizer, get_search_executor(), category_timeout=CATEGORY_TIMEOUT_SECONDS, **search
+    )
+
+def show_search():
+    """Show the current results; while a search runs, poll it and show categories as they finish"""
+    job = st.session_state.search_job
+    if job is not None:
+        # Check done before snapshotting, so a category finishing in between can't be left out of the final result
+        done = job.done
+        results = job.snapshot()
+        st.session_state.results = results
+        if done:
+            st.session_state.search_job = None
+            # Don't let a cancelled or timed-out search stand in for a complete one
+            if not job.cancelled and not results['incomplete_categories'] and not results['category_errors']:
+                get_result_cache().set(st.session_state.search_key, results)
+            # Rerun the whole page so the other tabs pick up the final results
+            st.rerun()
+        pending = ", ".join(c.replace('_', ' ') for c in results['pending_categories'])
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info(f"Searching {pending}... ({job.elapsed:.0f}s)")
+        with col2:
+            if st.button("Cancel Search"):
+                job.cancel()
+                st.rerun()
+    
+    results = st.session_state.results
+    if not results:
+        return
+    if results.get('incomplete_categories') and not results.get('pending_categories'):
+        skipped = ", ".join(c.replace('_', ' ') for c in results['incomplete_categories'])
+        st.warning(f"No results for {skipped} (cancelled or timed out); showing the categories that finished.")
+    render_search_results(results)
+
 def get_cpm_color(cpm):
     """Get color based on CPM value"""
     if cpm >= 2.0:
@@ -224,65 +179,173 @@ def get_cpm_color(cpm):
     else:
         return "cpm-low"
 
-def create_comparison_chart(results):
-    """Create comparison chart for redemption options"""
-    if not results or 'top_options_by_category' not in results:
-        return None
-    
-    data = []
-    categories = []
-    
+def chart_options(results):
+    """(category, description, cpm, cash_value, miles) for each option the Analysis charts plot"""
+    rows = []
     for category, options in results['top_options_by_category'].items():
         # Exclude gift cards from analysis visuals
         if category == 'gift_cards':
             continue
-        if options:
-            for option in options[:3]:  # Top 3 from each category
-                data.append({
-                    'Category': category.replace('_', ' ').title(),
-                    'Option': option['description'][:30] + '...' if len(option['description']) > 30 else option['description'],
-                    'CPM': option['cpm'],
-                    'Value': option['cash_value'],
-                    'Miles': option['miles_required']
-                })
-                categories.append(category.replace('_', ' ').title())
-    
-    if not data:
-        return None
-    
-    df = pd.DataFrame(data)
-    
-    fig = px.bar(
-        df,
-        x='Option',
-        y='CPM',
-        color='Category',
-        animation_frame='Category',
-        title='Redemption Options Comparison by CPM',
-        color_discrete_map={
-            'Flights': '#06b6d4',
-            'Hotels': '#7c3aed'
-        }
-    )
-    
+        title = category.replace('_', ' ').title()
+        rows.extend(
+            (title, option['description'], option['cpm'], option['cash_value'], option['miles_required'])
+            for option in options
+        )
+    return rows
+
+def results_digest(rows):
+    """Stable hash of the chart rows, used as the figure cache key"""
+    return hashlib.sha1(json.dumps(rows, default=str).encode('utf-8')).hexdigest()
+
+def apply_chart_theme(fig, **layout):
     fig.update_layout(
-        xaxis_title="Redemption Option",
-        yaxis_title="Cents Per Mile (CPM)",
-        height=500,
         template="plotly_dark",
         font=dict(family="Poppins, sans-serif", color="#e5e7eb"),
         paper_bgcolor="#0b0f15",
         plot_bgcolor="#0b0f15",
-        transition_duration=500
+        **layout
     )
-    fig.update_traces(marker_line_color='#1f2937', marker_line_width=1)
+    return fig
+
+def set_animation_speed(fig):
     try:
         fig.layout.updatemenus[0].buttons[0].args[1]["frame"]["duration"] = 800
         fig.layout.updatemenus[0].buttons[0].args[1]["transition"]["duration"] = 500
     except Exception:
         pass
-    
-    return fig
+
+def figure_json(fig):
+    """Plain-dict form of a figure: cheap to cache and accepted by st.plotly_chart"""
+    return json.loads(fig.to_json())
+
+def short_label(description):
+    return description[:30] + '...' if len(description) > 30 else description
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES, show_spinner=False)
+def comparison_chart_json(digest, _rows, animated=False):
+    """Bar chart of the top 3 options per category, cached on the results digest"""
+    top_rows = []
+    for category in dict.fromkeys(row[0] for row in _rows):
+        top_rows.extend([row for row in _rows if row[0] == category][:3])
+
+    if animated:
+        import pandas as pd
+        px = load_plotly_express()
+        df = pd.DataFrame(
+            [(category, short_label(description), cpm) for category, description, cpm, _, _ in top_rows],
+            columns=['Category', 'Option', 'CPM']
+        )
+        fig = px.bar(
+            df,
+            x='Option',
+            y='CPM',
+            color='Category',
+            animation_frame='Category',
+            title='Redemption Options Comparison by CPM',
+            color_discrete_map=CATEGORY_COLORS
+        )
+        set_animation_speed(fig)
+    else:
+        import plotly.graph_objects as go
+        fig = go.Figure(layout=dict(title='Redemption Options Comparison by CPM'))
+        for category in dict.fromkeys(row[0] for row in top_rows):
+            category_rows = [row for row in top_rows if row[0] == category]
+            fig.add_bar(
+                x=[short_label(row[1]) for row in category_rows],
+                y=[row[2] for row in category_rows],
+                name=category,
+                marker_color=CATEGORY_COLORS.get(category)
+            )
+
+    apply_chart_theme(
+        fig,
+        xaxis_title="Redemption Option",
+        yaxis_title="Cents Per Mile (CPM)",
+        height=500,
+        transition_duration=500 if animated else 0
+    )
+    fig.update_traces(marker_line_color='#1f2937', marker_line_width=1)
+    return figure_json(fig)
+
+def create_comparison_chart(results, animated=False):
+    """Create comparison chart for redemption options"""
+    if not results or 'top_options_by_category' not in results:
+        return None
+    rows = chart_options(results)
+    if not rows:
+        return None
+    return comparison_chart_json(results_digest(rows), rows, animated)
+
+def cpm_bin_edges(rows):
+    """CHART_BINS equal-width CPM bins shared by every category"""
+    low = min(row[2] for row in rows)
+    high = max(row[2] for row in rows)
+    width = (high - low) / CHART_BINS or 1.0
+    return [low + width * i for i in range(CHART_BINS + 1)]
+
+def cpm_bin(cpm, edges):
+    return min(bisect_right(edges, cpm) - 1, len(edges) - 2)
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES, show_spinner=False)
+def cpm_histogram_json(digest, _rows):
+    """CPM distribution, binned here so the payload is CHART_BINS bars per category"""
+    import plotly.graph_objects as go
+
+    edges = cpm_bin_edges(_rows)
+    centers = [(left + right) / 2 for left, right in zip(edges, edges[1:])]
+    fig = go.Figure(layout=dict(title='CPM Distribution by Category'))
+    for category in dict.fromkeys(row[0] for row in _rows):
+        counts = [0] * CHART_BINS
+        for row in _rows:
+            if row[0] == category:
+                counts[cpm_bin(row[2], edges)] += 1
+        fig.add_bar(x=centers, y=counts, width=edges[1] - edges[0], name=category,
+                    marker_color=CATEGORY_COLORS.get(category))
+    apply_chart_theme(fig, barmode='stack', bargap=0, xaxis_title='CPM', yaxis_title='count')
+    fig.update_traces(marker_line_color='#1f2937', marker_line_width=1)
+    return figure_json(fig)
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES, show_spinner=False)
+def value_scatter_json(digest, _rows, animated=False):
+    """Value vs CPM. Above CHART_DETAIL_MAX_OPTIONS points each category is
+    reduced to one marker per CPM bin (mean value, sized by count)."""
+    if animated:
+        import pandas as pd
+        px = load_plotly_express()
+        df = pd.DataFrame([(row[0], row[2], row[3]) for row in _rows], columns=['Category', 'CPM', 'Value'])
+        fig = px.scatter(df, x='CPM', y='Value', color='Category',
+                         animation_frame='Category', animation_group='Category',
+                         title='Value vs CPM Scatter Plot',
+                         hover_data=['Category'])
+        set_animation_speed(fig)
+        apply_chart_theme(fig, transition_duration=500)
+        return figure_json(fig)
+
+    import plotly.graph_objects as go
+    fig = go.Figure(layout=dict(title='Value vs CPM Scatter Plot'))
+    binned = len(_rows) > CHART_DETAIL_MAX_OPTIONS
+    edges = cpm_bin_edges(_rows) if binned else None
+    for category in dict.fromkeys(row[0] for row in _rows):
+        category_rows = [row for row in _rows if row[0] == category]
+        color = CATEGORY_COLORS.get(category)
+        if not binned:
+            fig.add_scatter(x=[row[2] for row in category_rows], y=[row[3] for row in category_rows],
+                            mode='markers', name=category, marker_color=color)
+            continue
+        bins = {}
+        for row in category_rows:
+            bins.setdefault(cpm_bin(row[2], edges), []).append(row)
+        points = sorted(bins.items())
+        counts = [len(members) for _, members in points]
+        fig.add_scatter(
+            x=[sum(row[2] for row in members) / len(members) for _, members in points],
+            y=[sum(row[3] for row in members) / len(members) for _, members in points],
+            mode='markers', name=category, customdata=counts,
+            hovertemplate='CPM %{x:.2f}<br>Value $%{y:,.2f}<br>%{customdata} options',
+            marker=dict(color=color, size=[min(8 + count ** 0.5, 40) for count in counts])
+        )
+    apply_chart_theme(fig, xaxis_title='CPM', yaxis_title='Value')
+    return figure_json(fig)
 
 def create_savings_calculator():
     """Create savings calculator"""
@@ -322,39 +385,162 @@ def create_savings_calculator():
         with col4:
             st.metric("Time Saved", f"{time_saved:.1f} hours")
 
+def create_gift_card_lookup(miles_balance):
+    """Gift card lookup with autocomplete over the full catalog"""
+    st.subheader("🎁 Gift Card Lookup")
+    catalog = get_gift_card_catalog()
+    
+    query = st.text_input("Gift Card Brand", placeholder="Start typing, e.g. starbucks")
+    if not query:
+        return
+    
+    # Prefix and typo-tolerant matches, best first
+    matches = catalog.search(query, limit=10)
+    if not matches:
+        st.info("No gift cards match that name.")
+        return
+    
+    brand = st.selectbox("Matching Gift Cards", matches, format_func=str.title)
+    miles_per_dollar = catalog.rates[brand]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Miles per $1", f"{miles_per_dollar:g}")
+    with col2:
+        st.metric("Your Balance Is Worth", f"${miles_balance / miles_per_dollar:,.2f}")
+
+@st.cache_resource
+def get_route_classifier():
+    """Airport index and per-route great-circle paths, loaded once per process"""
+    return RouteClassifier()
+
+def map_routes(results):
+    """(origin, destination, popup) for each flight option, the part of a result the map depends on"""
+    routes = []
+    for flight in results['top_options_by_category'].get('flights', []):
+        details = flight.get('details') or {}
+        origin = details.get('origin', '')
+        destination = details.get('destination', '')
+        if origin and destination:
+            routes.append((origin, destination, f"{flight['description']}<br>CPM: {flight['cpm']:.2f}"))
+    return tuple(routes)
+
+@st.cache_data(max_entries=MAP_CACHE_MAX_ENTRIES, show_spinner=False)
+def render_route_map(routes):
+    """Map HTML for a set of routes, plus the routes that have no known coordinates.
+
+    Cached on the routes, so reruns and tab switches reuse the serialized map.
+    """
+    import folium
+
+    classifier = get_route_classifier()
+    # Centered on the US when there is nothing to draw
+    m = folium.Map(location=[39.8283, -98.5795], zoom_start=4)
+    points = []
+    unmapped = []
+    for origin, destination, popup in routes:
+        path = classifier.path(origin, destination)
+        if path is None:
+            unmapped.append(f"{origin}-{destination}")
+            continue
+        folium.PolyLine(locations=path, popup=popup, color='blue', weight=2).add_to(m)
+        for code, point in ((origin, path[0]), (destination, path[-1])):
+            folium.CircleMarker(location=point, radius=4, tooltip=code, color='blue', fill=True).add_to(m)
+        points.extend(path)
+    if points:
+        m.fit_bounds([
+            [min(lat for lat, _ in points), min(lon for _, lon in points)],
+            [max(lat for lat, _ in points), max(lon for _, lon in points)],
+        ])
+    return m.get_root().render(), unmapped
+
 def create_map_view(results):
-    """Create map view for flight and hotel options"""
+    """Map HTML and unmapped routes for the flight options, or None without results"""
     if not results or 'top_options_by_category' not in results:
         return None
+    return render_route_map(map_routes(results))
+
+@st.cache_resource
+def load_results_table_template():
+    with open(RESULTS_TABLE_PATH, encoding='utf-8') as template_file:
+        return template_file.read()
+
+def results_table_html(options, min_cpm=None, max_miles=None):
+    """One category's options as a single HTML table, sorted, filtered and paged in the browser.
+
+    ``min_cpm`` and ``max_miles`` are the sidebar filters the search already
+    applied; the table's own filters start from them and can only narrow.
+    """
+    rows = [
+        {
+            'rank': i,
+            'description': option['description'],
+            'value': option['cash_value'],
+            'miles': option['miles_required'],
+            'cpm': option['cpm'],
+            'cpm_class': get_cpm_color(option['cpm']),
+        }
+        for i, option in enumerate(options, 1)
+    ]
+    # Escape markup characters so no description can end the <script> block that carries the data
+    options_json = (json.dumps(rows)
+                    .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+    values = {
+        'OPTIONS_JSON': options_json,
+        'PAGE_SIZE': str(RESULTS_PAGE_SIZE),
+        'MIN_CPM': json.dumps(min_cpm),
+        'MAX_MILES': json.dumps(max_miles),
+    }
+    # One pass, so substituted data is never scanned for placeholders again
+    return RESULTS_TABLE_PLACEHOLDER.sub(lambda match: values[match.group(1)], load_results_table_template())
+
+def render_search_results(results):
+    """Summary, best option and top options per category for a search result"""
+    # Summary metrics
+    st.subheader("📊 Summary")
+    col1, col2, col3, col4 = st.columns(4)
     
-    # Create a map centered on US
-    m = folium.Map(location=[39.8283, -98.5795], zoom_start=4)
+    with col1:
+        st.metric("Total Options", 9 + 25 + 201)
     
-    # Add flight routes
-    flights = results['top_options_by_category'].get('flights', [])
-    for flight in flights:
-        if 'details' in flight:
-            origin = flight['details'].get('origin', '')
-            destination = flight['details'].get('destination', '')
-            
-            # Simple coordinates (in real app, you'd use geocoding)
-            coords = {
-                'JFK': [40.6413, -73.7781],
-                'LAX': [33.9416, -118.4085],
-                'ORD': [41.9786, -87.9048],
-                'DFW': [32.8968, -97.0380],
-                'ATL': [33.6407, -84.4277]
-            }
-            
-            if origin in coords and destination in coords:
-                folium.PolyLine(
-                    locations=[coords[origin], coords[destination]],
-                    popup=f"{flight['description']}<br>CPM: {flight['cpm']:.2f}",
-                    color='blue',
-                    weight=2
-                ).add_to(m)
+    with col2:
+        st.metric("Flight Options", 9)
+    
+    with col3:
+        st.metric("Hotel Options", 25)
+    
+    with col4:
+        st.metric("Gift Card Options", 201)
+    
+    # Best overall recommendation
+    if results['best_overall_recommendation']:
+        best = results['best_overall_recommendation']
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🏆 Best Overall Value</h3>
+            <p><strong>{best['description']}</strong></p>
+            <p>Value: ${best['cash_value']:,.2f} | Miles: {best['miles_required']:,} | CPM: <span class="{get_cpm_color(best['cpm'])}">{best['cpm']:.2f}</span></p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Category results
+    for category, options in results['top_options_by_category'].items():
+        icon = '🛫' if category == 'flights' else '🏨' if category == 'hotels' else '🎁'
+        label = category.replace('_', ' ').title()
+        if options:
+            st.subheader(f"{icon} {label} Options")
     
-    return m
+            # Options already respect the sidebar filters; they are applied during the search
+            rows_shown = min(len(options), RESULTS_PAGE_SIZE)
+            components.html(
+                results_table_html(options, **st.session_state.search_filters),
+                height=RESULTS_TABLE_CHROME_PX + rows_shown * RESULTS_ROW_PX,
+                scrolling=True
+            )
+        elif category in results.get('pending_categories', []):
+            st.info(f"Searching {label.lower()}...")
+        else:
+            st.info(f"No {label} redemption options found matching your filters.")
 
 def main():
     # Header
@@ -380,8 +566,8 @@ def main():
         
         # Filters
         st.subheader("🔍 Filters")
-        min_cpm = st.slider("Minimum CPM", 0.0, 5.0, 1.0, 0.1)
-        max_miles = st.slider("Maximum Miles", 0, 200000, 100000, 1000)
+        min_cpm = st.slider("Minimum CPM", 0.0, 5.0, 1.0, 0.1, help="Applied when you search")
+        max_miles = st.slider("Maximum Miles", 0, 200000, 100000, 1000, help="Applied when you search")
         
         # Search options
         st.subheader("🔎 Search Options")
@@ -446,84 +632,26 @@ def main():
             st.markdown('</div>', unsafe_allow_html=True)
             
             if submitted:
-                with st.spinner("Analyzing redemption options..."):
-                    try:
-                        result = optimizer.optimize_redemption(
-                            user_miles=miles_balance,
-                            origin=origin if search_flights else None,
-                            destination=destination if search_flights else None,
-                            departure_date=departure_date.strftime('%Y-%m-%d') if search_flights else None,
-                            city_name=city_name if search_hotels else None,
-                            check_in_date=check_in.strftime('%Y-%m-%d') if search_hotels else None,
-                            check_out_date=check_out.strftime('%Y-%m-%d') if search_hotels else None
-                        )
-                        
-                        st.session_state.results = result
-                        st.success("Analysis complete!")
-                        # Notify when mock flight data is used
-                        try:
-                            if getattr(optimizer, 'last_used_mock_flights', False):
-                                #st.info("Showing sample flight results (live API unavailable).")
-                                pass
-                        except Exception:
-                            pass
-                        
-                    except Exception as e:
-                        st.error(f"Error during analysis: {e}")
+                try:
+                    start_search(
+                        optimizer,
+                        user_miles=miles_balance,
+                        origin=origin if search_flights else None,
+                        destination=destination if search_flights else None,
+                        departure_date=departure_date.strftime('%Y-%m-%d') if search_flights else None,
+                        city_name=city_name if search_hotels else None,
+                        check_in_date=check_in.strftime('%Y-%m-%d') if search_hotels else None,
+                        check_out_date=check_out.strftime('%Y-%m-%d') if search_hotels else None,
+                        min_cpm=min_cpm,
+                        max_miles=max_miles,
+                        top_k=RESULTS_PER_CATEGORY
+                    )
+                except Exception as e:
+                    st.error(f"Error during analysis: {e}")
         
-        # Display results
-        if st.session_state.results:
-            results = st.session_state.results
-            
-            # Summary metrics
-            st.subheader("📊 Summary")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Options", 9 + 25 + 201)
-            
-            with col2:
-                st.metric("Flight Options", 9)
-            
-            with col3:
-                st.metric("Hotel Options", 25)
-            
-            with col4:
-                st.metric("Gift Card Options", 201)
-            
-            # Best overall recommendation
-            if results['best_overall_recommendation']:
-                best = results['best_overall_recommendation']
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3>🏆 Best Overall Value</h3>
-                    <p><strong>{best['description']}</strong></p>
-                    <p>Value: ${best['cash_value']:,.2f} | Miles: {best['miles_required']:,} | CPM: <span class="{get_cpm_color(best['cpm'])}">{best['cpm']:.2f}</span></p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Category results
-            for category, options in results['top_options_by_category'].items():
-                icon = '🛫' if category == 'flights' else '🏨' if category == 'hotels' else '🎁'
-                label = category.replace('_', ' ').title()
-                if options:
-                    st.subheader(f"{icon} Top {label} Options")
-                    
-                    filtered = [o for o in options if o['cpm'] >= min_cpm and o['miles_required'] <= max_miles]
-                    if filtered:
-                        for i, option in enumerate(filtered, 1):
-                            st.markdown(f"""
-                            <div class="option-card">
-                                <h4>{i}. {option['description']}</h4>
-                                <p><strong>Value:</strong> ${option['cash_value']:,.2f} | 
-                                <strong>Miles:</strong> {option['miles_required']:,} | 
-                                <strong>CPM:</strong> <span class="{get_cpm_color(option['cpm'])}">{option['cpm']:.2f}</span></p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        st.info(f"No {label} redemption options found matching your filters.")
-                else:
-                    st.info(f"No {label} redemption options found in this section.")
+        # Results of the running or last search; refreshed while a background search is in progress
+        job = st.session_state.search_job
+        st.fragment(show_search, run_every=SEARCH_POLL_SECONDS if job else None)()
     
     with tab3:
         st.header("📊 Analysis & Insights")
@@ -533,7 +661,13 @@ def main():
             
             # Comparison chart
             st.subheader("📈 Comparison Chart")
-            chart = create_comparison_chart(results)
+            chart_rows = chart_options(results)
+            animated = st.toggle(
+                "Animate charts", value=False,
+                disabled=len(chart_rows) > CHART_DETAIL_MAX_OPTIONS,
+                help="Step through categories one at a time. Off for large result sets."
+            ) and len(chart_rows) <= CHART_DETAIL_MAX_OPTIONS
+            chart = create_comparison_chart(results, animated)
             if chart:
                 st.plotly_chart(chart, use_container_width=True)
             
@@ -541,68 +675,33 @@ def main():
             st.subheader("🗺️ Map View")
             map_view = create_map_view(results)
             if map_view:
-                folium_static(map_view)
+                map_html, unmapped = map_view
+                components.html(map_html, height=MAP_HEIGHT)
+                if unmapped:
+                    st.caption(f"No coordinates for: {', '.join(unmapped)}")
             
             # Detailed analysis
             st.subheader("📋 Detailed Analysis")
             
             col1, col2 = st.columns(2)
+            digest = results_digest(chart_rows)
             
             with col1:
                 # CPM distribution
-                all_options = []
-                for category, options in results['top_options_by_category'].items():
-                    # Exclude gift cards from analysis visuals
-                    if category == 'gift_cards':
-                        continue
-                    for option in options:
-                        all_options.append({
-                            'Category': category.replace('_', ' ').title(),
-                            'CPM': option['cpm'],
-                            'Value': option['cash_value']
-                        })
-                
-                if all_options:
-                    df = pd.DataFrame(all_options)
-                    fig = px.histogram(df, x='CPM', color='Category', 
-                                     title='CPM Distribution by Category',
-                                     nbins=20)
-                    fig.update_layout(
-                        template="plotly_dark",
-                        font=dict(family="Poppins, sans-serif", color="#e5e7eb"),
-                        paper_bgcolor="#0b0f15",
-                        plot_bgcolor="#0b0f15",
-                        transition_duration=500
-                    )
-                    fig.update_traces(marker_line_color='#1f2937', marker_line_width=1)
-                    st.plotly_chart(fig, use_container_width=True)
+                if chart_rows:
+                    st.plotly_chart(cpm_histogram_json(digest, chart_rows), use_container_width=True)
             
             with col2:
                 # Value vs CPM scatter
-                if all_options:
-                    fig = px.scatter(df, x='CPM', y='Value', color='Category',
-                                   animation_frame='Category', animation_group='Category',
-                                   title='Value vs CPM Scatter Plot',
-                                   hover_data=['Category'])
-                    fig.update_layout(
-                        template="plotly_dark",
-                        font=dict(family="Poppins, sans-serif", color="#e5e7eb"),
-                        paper_bgcolor="#0b0f15",
-                        plot_bgcolor="#0b0f15",
-                        transition_duration=500
-                    )
-                    try:
-                        fig.layout.updatemenus[0].buttons[0].args[1]["frame"]["duration"] = 800
-                        fig.layout.updatemenus[0].buttons[0].args[1]["transition"]["duration"] = 500
-                    except Exception:
-                        pass
-                    st.plotly_chart(fig, use_container_width=True)
+                if chart_rows:
+                    st.plotly_chart(value_scatter_json(digest, chart_rows, animated), use_container_width=True)
         else:
             st.info("Run a search first to see analysis and insights.")
     
     with tab4:
         st.header("💰 Savings Calculator")
         create_savings_calculator()
+        create_gift_card_lookup(miles_balance)
     
     with tab5:
         st.header("💬 User Feedback")
@@ -0,0 +1,52 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def top_k_eligible(balances: np.ndarray, thresholds: np.ndarray, k: int = 3,
+                   chunk_size: int = 8192) -> np.ndarray:
+    """Positions of the first ``k`` options each balance can afford.
+
+    ``thresholds`` holds the miles needed for each option, with options already
+    ordered best first. Returns an ``(len(balances), k)`` int32 array of
+    option positions, padded with -1 where fewer than ``k`` are affordable.
+    Balances are processed ``chunk_size`` rows at a time to bound the size of
+    the eligibility matrix.
+    """
+    balances = np.asarray(balances, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    top = np.full((len(balances), k), -1, dtype=np.int32)
+    if not len(thresholds) or not k:
+        return top
+    rank_dtype = np.int16 if len(thresholds) < np.iinfo(np.int16).max else np.int32
+    for start in range(0, len(balances), chunk_size):
+        chunk = balances[start:start + chunk_size]
+        eligible = chunk[:, None] >= thresholds[None, :]
+        # rank[i, j] is how many options up to and including j balance i can afford
+        rank = np.cumsum(eligible, axis=1, dtype=rank_dtype)
+        affordable = rank[:, -1]
+        for j in range(k):
+            has = affordable > j
+            if not has.any():
+                break
+            position = np.argmax(eligible & (rank == j + 1), axis=1)
+            top[start:start + chunk_size, j] = np.where(has, position, -1)
+    return top
+
+
+def best_across(top_positions: Sequence[np.ndarray], scores: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick the best first choice across categories for every balance.
+
+    ``top_positions[c]`` is the ``top_k_eligible`` result for category ``c`` and
+    ``scores[c]`` the per-option score it was ordered by. Returns the winning
+    category index (-1 if nothing is affordable) and its score. Ties go to
+    the earlier category.
+    """
+    best_scores = np.stack([
+        np.where(top[:, 0] >= 0, np.asarray(score, dtype=np.float64)[top[:, 0]] if len(score) else 0.0, -np.inf)
+        for top, score in zip(top_positions, scores)
+    ])
+    category = np.argmax(best_scores, axis=0).astype(np.int8)
+    best = best_scores[category, np.arange(best_scores.shape[1])]
+    category[np.isneginf(best)] = -1
+    return category, best
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import AIRLINE_NAMES, FlightDataCollector  # noqa: E402
+
+CABINS = ['ECONOMY', 'PREMIUM_ECONOMY', 'BUSINESS', 'FIRST']
+AIRPORTS = ['JFK', 'LAX', 'ORD', 'DFW', 'ATL', 'SFO', 'MAD', 'BCN', 'LHR', 'CDG', 'BER', 'NRT', 'SYD', 'GRU']
+
+
+def make_flight_offers(count: int, seed: int = 0):
+    """Amadeus flight-offers payload with ``count`` offers of one to three segments."""
+    rng = random.Random(seed)
+    carriers = list(AIRLINE_NAMES)
+    start = date(2025, 8, 1)
+    offers = []
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(32))
+        carrier = rng.choice(carriers)
+        hour = rng.randrange(24)
+        segments = []
+        for leg in range(rng.choice((1, 1, 1, 2, 3))):
+            segments.append({
+                'departure': {'iataCode': rng.choice(AIRPORTS), 'at': f"{day}T{(hour + 3 * leg) % 24:02d}:15:00"},
+                'arrival': {'iataCode': rng.choice(AIRPORTS), 'at': f"{day}T{(hour + 3 * leg + 2) % 24:02d}:45:00"},
+                'carrierCode': carrier,
+                'number': str(rng.randrange(1, 9999)),
+                'aircraft': {'code': rng.choice(['321', '738', '77W', '789'])},
+                'cabin': rng.choice(CABINS),
+                'numberOfBookableSeats': rng.randrange(1, 10),
+            })
+        offers.append({
+            'id': str(i),
+            'itineraries': [{'duration': f"PT{rng.randrange(1, 16)}H{rng.randrange(60)}M", 'segments': segments}],
+            'price': {'total': f"{rng.uniform(49, 2500):.2f}", 'currency': rng.choice(['USD', 'EUR'])},
+        })
+    return offers
+
+
+@pytest.fixture(scope="session")
+def collector_class():
+    """FlightDataCollector with the Amadeus client stubbed out; no credentials or network needed."""
+    class OfflineCollector(FlightDataCollector):
+        def _initialize_amadeus_client(self):
+            return None
+    return OfflineCollector
+
+
+@pytest.fixture(scope="session")
+def collected_flights(collector_class):
+    """Parsed FlightRecords for 20,000 synthetic offers."""
+    collector = collector_class()
+    return collector.parse_flight_data(make_flight_offers(20_000), "Synthetic route", "JFK", "LAX")
+
+
+@pytest.fixture
+def collector(collector_class, collected_flights):
+    collector = collector_class()
+    collector.collected_flights = list(collected_flights)
+    return collector
+
+
+@pytest.fixture(scope="session")
+def optimizer(tmp_path_factory):
+    from algorithm import RedemptionOptimizer
+    from providers import MockOfferProvider
+    from response_cache import ResponseCache
+
+    cache = ResponseCache(directory=str(tmp_path_factory.mktemp("flight_cache")))
+    return RedemptionOptimizer(response_cache=cache, provider=MockOfferProvider())
@@ -0,0 +1,40 @@
+import contextlib
+import io
+import itertools
+
+import pytest
+
+from conftest import make_flight_offers
+from main import export_to_sql
+
+
+@pytest.mark.parametrize("offer_count", [1_000, 20_000])
+def test_parse_flight_data(benchmark, collector_class, offer_count):
+    collector = collector_class()
+    offers = make_flight_offers(offer_count)
+    flights = benchmark(collector.parse_flight_data, offers, "Synthetic route", "JFK", "LAX")
+    assert len(flights) == offer_count
+
+
+def test_get_statistics(benchmark, collector):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            collector.get_statistics()
+
+    benchmark(run)
+
+
+def test_export_to_csv(benchmark, collector, tmp_path):
+    path = str(tmp_path / "flights.csv")
+    assert benchmark(collector.export_to_csv, path) == path
+
+
+def test_export_to_sql(benchmark, collected_flights, tmp_path):
+    # A new database each round, so every round inserts rather than updates
+    paths = (str(tmp_path / f"flights_{i}.db") for i in itertools.count())
+
+    def setup():
+        return (collected_flights, next(paths)), {}
+
+    written = benchmark.pedantic(export_to_sql, setup=setup, rounds=5)
+    assert written == len(collected_flights)
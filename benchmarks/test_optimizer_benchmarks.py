@@ -0,0 +1,37 @@
+import itertools
+
+import pytest
+
+from conftest import AIRPORTS
+
+ROUTES = list(itertools.permutations(AIRPORTS, 2))
+
+
+@pytest.mark.parametrize("categories", [None, ['gift_cards']], ids=["all", "gift_cards"])
+def test_optimize_redemption(benchmark, optimizer, categories):
+    result = benchmark(
+        optimizer.optimize_redemption, 50_000,
+        origin="JFK", destination="LAX", departure_date="2025-08-15",
+        city_name="New York", check_in_date="2025-08-15", check_out_date="2025-08-18",
+        categories=categories
+    )
+    assert result['best_overall_recommendation'] is not None
+
+
+@pytest.mark.parametrize("limit", [3, None], ids=["top3", "all"])
+def test_analyze_gift_card_redemptions(benchmark, optimizer, limit):
+    options = benchmark(optimizer.analyze_gift_card_redemptions, 50_000, limit=limit)
+    assert options
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "cold"])
+def test_calculate_route_type(benchmark, optimizer, cached):
+    classify = optimizer.route_classifier.classify
+
+    def run():
+        if not cached:
+            classify.cache_clear()
+        return [optimizer.calculate_route_type(origin, destination) for origin, destination in ROUTES]
+
+    route_types = benchmark(run)
+    assert set(route_types) <= {'short_haul', 'domestic', 'international'}
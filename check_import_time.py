@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cold-start budget per module, in milliseconds (best of several runs)
+BUDGETS_MS = {
+    'algorithm': 100,
+    'app': 1000,
+}
+
+# Heavy libraries that must only be imported by the code paths that use them
+DEFERRED_MODULES = ('pandas', 'numpy', 'amadeus', 'plotly.express', 'folium')
+
+
+def measure_import(module: str) -> Tuple[float, Set[str]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns the cumulative import time in milliseconds and the names of every
+    module that was loaded along the way.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    cumulative_us = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {module}")
+    return cumulative_us / 1000, loaded
+
+
+def check(budgets: Dict[str, float], runs: int = 3) -> bool:
+    ok = True
+    for module, budget_ms in budgets.items():
+        timings = []
+        loaded = set()
+        for _ in range(runs):
+            elapsed_ms, loaded = measure_import(module)
+            timings.append(elapsed_ms)
+        best_ms = min(timings)
+        eager = [name for name in DEFERRED_MODULES if name in loaded]
+        status = 'OK' if best_ms <= budget_ms and not eager else 'FAIL'
+        print(f"{status:4} {module:12} {best_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+        if eager:
+            print(f"     imports {', '.join(eager)} at startup; import them where they are used")
+        ok = ok and status == 'OK'
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when cold-start import time exceeds its budget")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module; the fastest is compared")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="Override or add a budget, e.g. --budget app=1500")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budgets = dict(BUDGETS_MS)
+    for override in args.budget:
+        module, _, budget_ms = override.partition('=')
+        budgets[module] = float(budget_ms)
+    sys.exit(0 if check(budgets, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
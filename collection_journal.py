@@ -0,0 +1,57 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+
+class CollectionJournal:
+    """SQLite checkpoint of finished (route, date) collection units.
+
+    Each unit is written as soon as its search has been parsed, together with
+    the parsed offers, so an interrupted run can be resumed without searching
+    the completed units again.
+    """
+
+    def __init__(self, path: str = "collection_journal.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS completed_units (
+                origin TEXT NOT NULL,
+                destination TEXT NOT NULL,
+                departure_date TEXT NOT NULL,
+                flight_count INTEGER NOT NULL,
+                flights TEXT NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (origin, destination, departure_date)
+            )
+        """)
+        self.conn.commit()
+
+    def reset(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM completed_units")
+
+    def completed_units(self) -> Set[Tuple[str, str, str]]:
+        rows = self.conn.execute("SELECT origin, destination, departure_date FROM completed_units")
+        return set(rows)
+
+    def record(self, origin: str, destination: str, departure_date: str, flights: List[Dict]):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO completed_units VALUES (?, ?, ?, ?, ?, ?)",
+                (origin, destination, departure_date, len(flights), json.dumps(flights),
+                 datetime.now().isoformat())
+            )
+
+    def load(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
+        row = self.conn.execute(
+            "SELECT flights FROM completed_units WHERE origin = ? AND destination = ? AND departure_date = ?",
+            (origin, destination, departure_date)
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,115 @@
+import argparse
+import os
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from algorithm import AWARD_CHARTS, award_miles_for
+from route_classifier import RouteClassifier
+
+# Award CPM is cents of US dollars per mile. Fares in other currencies are converted
+# with these USD-per-unit rates (extend with --usd-rate); fares without a rate are not scored
+USD_RATES = {'USD': 1.0}
+
+REPORT_COLUMNS = [
+    'route_name', 'departure_date', 'cpm_rank', 'origin', 'destination', 'route_type',
+    'airline_code', 'airline_name', 'flight_number', 'departure_time', 'booking_class',
+    'price_amount', 'price_currency', 'price_usd', 'award_miles', 'cpm',
+]
+
+
+def load_flights(source: str = "flight_data_export.csv", table: str = "flight_data_sql") -> pd.DataFrame:
+    """Load collected flights from the CSV export or the SQLite database."""
+    if source.endswith(('.db', '.sqlite', '.sqlite3')):
+        with sqlite3.connect(source) as conn:
+            return pd.read_sql_query(f"SELECT * FROM {table}", conn)
+    # Keep 'N/A' (unknown cabin or aircraft) as text rather than NaN
+    return pd.read_csv(source, dtype={'flight_number': str}, keep_default_na=False)
+
+
+def attach_cpm(flights: pd.DataFrame, classifier: Optional[RouteClassifier] = None,
+               award_charts: dict = AWARD_CHARTS, usd_rates: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Add route_type, award_miles, price_usd and cpm columns, computed column-wise for every row.
+
+    ``usd_rates`` adds to USD_RATES. Fares in a currency without a rate get
+    NaN price_usd and cpm.
+    """
+    classifier = classifier or RouteClassifier()
+    flights = flights.copy()
+    flights['route_type'] = classifier.classify_many(
+        flights['origin'].to_numpy(dtype=str), flights['destination'].to_numpy(dtype=str)
+    )
+    flights['award_miles'] = award_miles_for(
+        flights['route_type'].to_numpy(dtype=str), flights['booking_class'].fillna('').to_numpy(dtype=str),
+        award_charts
+    )
+    rates = {**USD_RATES, **(usd_rates or {})}
+    flights['price_usd'] = flights['price_amount'].astype(float) * flights['price_currency'].map(rates)
+    flights['cpm'] = flights['price_usd'] / flights['award_miles'] * 100
+    return flights
+
+
+def rank_by_route_and_date(flights: pd.DataFrame, top: Optional[int] = None) -> pd.DataFrame:
+    """Order by route and date, best CPM first, numbering offers within each route/date.
+
+    Offers without a CPM (no USD rate for their currency) are left out.
+    """
+    ranked = flights[flights['cpm'].notna()].sort_values(
+        ['route_name', 'departure_date', 'cpm'], ascending=[True, True, False], kind='mergesort'
+    )
+    ranked['cpm_rank'] = ranked.groupby(['route_name', 'departure_date'], sort=False).cumcount() + 1
+    if top is not None:
+        ranked = ranked[ranked['cpm_rank'] <= top]
+    return ranked[[column for column in REPORT_COLUMNS if column in ranked.columns]].reset_index(drop=True)
+
+
+def build_report(source: str = "flight_data_export.csv", output: str = "flight_cpm_report.csv",
+                 top: Optional[int] = None, usd_rates: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    report = rank_by_route_and_date(attach_cpm(load_flights(source), usd_rates=usd_rates), top)
+    report.to_csv(output, index=False, float_format='%.4f')
+    return report
+
+
+def parse_rate(value: str) -> Tuple[str, float]:
+    currency, _, rate = value.partition('=')
+    try:
+        return currency.strip().upper(), float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected CURRENCY=RATE, got {value!r}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rank collected cash fares by award CPM")
+    parser.add_argument("--source", default="flight_data_export.csv",
+                        help="Collected flights: the CSV export or the SQLite database (.db)")
+    parser.add_argument("--output", default="flight_cpm_report.csv", help="Where to write the ranked report")
+    parser.add_argument("--top", type=int, default=None,
+                        help="Keep only the N best offers per route and date")
+    parser.add_argument("--usd-rate", type=parse_rate, action="append", default=[], metavar="CURRENCY=RATE",
+                        help="US dollars per unit of another currency, e.g. --usd-rate EUR=1.08. "
+                             "Fares in currencies without a rate are skipped")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.source):
+        print(f"{args.source} not found. Run main.py to collect flight data first.")
+        return
+    flights = attach_cpm(load_flights(args.source), usd_rates=dict(args.usd_rate))
+    report = rank_by_route_and_date(flights, args.top)
+    report.to_csv(args.output, index=False, float_format='%.4f')
+    print(f"Wrote {len(report)} ranked offers to {args.output}")
+    unpriced = flights.loc[flights['cpm'].isna(), 'price_currency'].value_counts()
+    for currency, count in unpriced.items():
+        print(f"Skipped {count} offers priced in {currency}; pass --usd-rate {currency}=<rate> to include them")
+    if not report.empty:
+        best = report.sort_values('cpm', ascending=False, kind='mergesort').head(10)
+        print("\n=== BEST CPM OFFERS ===")
+        print(best[['route_name', 'departure_date', 'flight_number', 'booking_class',
+                    'price_amount', 'price_currency', 'price_usd', 'award_miles', 'cpm']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
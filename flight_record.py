@@ -0,0 +1,115 @@
+import sys
+from datetime import date
+from typing import Dict, Tuple
+
+FIELD_NAMES = (
+    'route_name', 'origin', 'destination', 'departure_date', 'arrival_date',
+    'departure_time', 'arrival_time', 'airline_code', 'airline_name', 'flight_number',
+    'aircraft_code', 'price_amount', 'price_currency', 'duration', 'stops',
+    'booking_class', 'seats_available', 'collected_at',
+)
+
+
+def parse_day(value: str) -> int:
+    """'YYYY-MM-DD' -> proleptic Gregorian ordinal."""
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10])).toordinal()
+
+
+def format_day(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+def parse_clock(value: str) -> int:
+    """'HH:MM[:SS]' -> seconds since midnight."""
+    return int(value[0:2]) * 3600 + int(value[3:5]) * 60 + (int(value[6:8]) if len(value) >= 8 else 0)
+
+
+def format_clock(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class FlightRecord:
+    """Compact representation of one collected flight offer.
+
+    Low-cardinality labels (route, airports, airline, currency, cabin) are
+    interned so every record shares the same string objects. Dates are stored
+    as ordinals and clock times as seconds since midnight. The duration keeps
+    the ISO 8601 string Amadeus sent (interned, exported unchanged). The string
+    forms used by the CSV/SQL exports are exposed as properties and through
+    ``as_row``/``as_dict``.
+    """
+
+    __slots__ = (
+        'route_name', 'origin', 'destination', 'departure_day', 'arrival_day',
+        'departure_seconds', 'arrival_seconds', 'airline_code', 'airline_name', 'flight_number',
+        'aircraft_code', 'price_amount', 'price_currency', 'duration', 'stops',
+        'booking_class', 'seats_available', 'collected_at',
+    )
+
+    def __init__(self, route_name: str, origin: str, destination: str, departure_day: int, arrival_day: int,
+                 departure_seconds: int, arrival_seconds: int, airline_code: str, airline_name: str,
+                 flight_number: str, aircraft_code: str, price_amount: float, price_currency: str,
+                 duration: str, stops: int, booking_class: str, seats_available: int, collected_at: str):
+        intern = sys.intern
+        self.route_name = intern(route_name)
+        self.origin = intern(origin)
+        self.destination = intern(destination)
+        self.departure_day = departure_day
+        self.arrival_day = arrival_day
+        self.departure_seconds = departure_seconds
+        self.arrival_seconds = arrival_seconds
+        self.airline_code = intern(airline_code)
+        self.airline_name = intern(airline_name)
+        self.flight_number = flight_number
+        self.aircraft_code = intern(aircraft_code)
+        self.price_amount = price_amount
+        self.price_currency = intern(price_currency)
+        self.duration = intern(duration)
+        self.stops = stops
+        self.booking_class = intern(booking_class)
+        self.seats_available = seats_available
+        self.collected_at = collected_at
+
+    @property
+    def departure_date(self) -> str:
+        return format_day(self.departure_day)
+
+    @property
+    def arrival_date(self) -> str:
+        return format_day(self.arrival_day)
+
+    @property
+    def departure_time(self) -> str:
+        return format_clock(self.departure_seconds)
+
+    @property
+    def arrival_time(self) -> str:
+        return format_clock(self.arrival_seconds)
+
+    def as_row(self) -> Tuple:
+        """Export values in FIELD_NAMES order, with dates, times and duration as strings."""
+        return (
+            self.route_name, self.origin, self.destination, self.departure_date, self.arrival_date,
+            self.departure_time, self.arrival_time, self.airline_code, self.airline_name, self.flight_number,
+            self.aircraft_code, self.price_amount, self.price_currency, self.duration, self.stops,
+            self.booking_class, self.seats_available, self.collected_at,
+        )
+
+    def as_dict(self) -> Dict:
+        return dict(zip(FIELD_NAMES, self.as_row()))
+
+    @classmethod
+    def from_dict(cls, flight: Dict) -> 'FlightRecord':
+        return cls(
+            flight['route_name'], flight['origin'], flight['destination'],
+            parse_day(flight['departure_date']), parse_day(flight['arrival_date']),
+            parse_clock(flight['departure_time']), parse_clock(flight['arrival_time']),
+            flight['airline_code'], flight['airline_name'], flight['flight_number'],
+            flight['aircraft_code'], float(flight['price_amount']), flight['price_currency'],
+            flight['duration'], int(flight['stops']), flight['booking_class'],
+            int(flight['seats_available']), flight['collected_at'],
+        )
+
+    def __repr__(self) -> str:
+        return (f"FlightRecord({self.flight_number} {self.origin}->{self.destination} "
+                f"{self.departure_date} {self.departure_time} {self.price_amount} {self.price_currency})")
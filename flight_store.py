@@ -0,0 +1,103 @@
+import sqlite3
+from itertools import islice
+from typing import Iterable, List, Tuple
+
+from flight_record import FlightRecord
+
+FLIGHT_COLUMNS: List[Tuple[str, str]] = [
+    ('route_name', 'TEXT NOT NULL'),
+    ('origin', 'TEXT NOT NULL'),
+    ('destination', 'TEXT NOT NULL'),
+    ('departure_date', 'TEXT NOT NULL'),
+    ('arrival_date', 'TEXT NOT NULL'),
+    ('departure_time', 'TEXT NOT NULL'),
+    ('arrival_time', 'TEXT NOT NULL'),
+    ('airline_code', 'TEXT NOT NULL'),
+    ('airline_name', 'TEXT'),
+    ('flight_number', 'TEXT NOT NULL'),
+    ('aircraft_code', 'TEXT'),
+    ('price_amount', 'REAL NOT NULL'),
+    ('price_currency', 'TEXT NOT NULL'),
+    ('duration', 'TEXT'),
+    ('stops', 'INTEGER NOT NULL'),
+    ('booking_class', 'TEXT NOT NULL'),
+    ('seats_available', 'INTEGER'),
+    ('collected_at', 'TEXT'),
+]
+# Same order as flight_record.FIELD_NAMES, so FlightRecord.as_row() binds directly
+COLUMN_NAMES = [name for name, _ in FLIGHT_COLUMNS]
+
+# One row per itinerary, cabin and fare. Branded fares for the same flight and
+# cabin differ in price and are kept apart; re-collecting a fare refreshes availability
+NATURAL_KEY = ('route_name', 'flight_number', 'departure_date', 'departure_time',
+               'arrival_date', 'arrival_time', 'stops', 'booking_class', 'price_amount', 'price_currency')
+_KEY_POSITIONS = [COLUMN_NAMES.index(name) for name in NATURAL_KEY]
+# Unique indexes over earlier versions of the key, replaced by ensure_schema
+_OLD_KEY_INDEXES = ('natural_key',)
+
+
+class FlightStore:
+    """Incremental SQLite writer for collected flight offers.
+
+    Offers are upserted on their natural key inside a single transaction, so
+    each run only pays for the rows it collected instead of rebuilding the table.
+    """
+
+    def __init__(self, db_path: str = "database.db", table: str = "flight_data_sql", batch_size: int = 500):
+        self.db_path = db_path
+        self.table = table
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(db_path)
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        columns = ",\n    ".join(f"{name} {declaration}" for name, declaration in FLIGHT_COLUMNS)
+        key_index = f"idx_{self.table}_fare_key"
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (\n    {columns}\n)")
+            for old_index in _OLD_KEY_INDEXES:
+                self.conn.execute(f"DROP INDEX IF EXISTS idx_{self.table}_{old_index}")
+            has_key_index = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (key_index,)
+            ).fetchone()
+            if not has_key_index:
+                # Tables written by the old full-rewrite export may hold duplicates
+                key = ", ".join(NATURAL_KEY)
+                self.conn.execute(
+                    f"DELETE FROM {self.table} WHERE rowid NOT IN "
+                    f"(SELECT MAX(rowid) FROM {self.table} GROUP BY {key})"
+                )
+                self.conn.execute(f"CREATE UNIQUE INDEX {key_index} ON {self.table} ({key})")
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_route_date ON {self.table} (route_name, departure_date)"
+            )
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_airline ON {self.table} (airline_code)"
+            )
+
+    def _upsert_sql(self) -> str:
+        placeholders = ", ".join("?" for _ in COLUMN_NAMES)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in COLUMN_NAMES if name not in NATURAL_KEY)
+        return (f"INSERT INTO {self.table} ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders}) "
+                f"ON CONFLICT ({', '.join(NATURAL_KEY)}) DO UPDATE SET {updates}")
+
+    def upsert(self, flights: Iterable[FlightRecord]) -> int:
+        """Insert or refresh ``flights`` in one transaction.
+
+        Returns the number of table rows written. Offers sharing a key
+        collapse into one row, so this can be less than the number of offers.
+        """
+        sql = self._upsert_sql()
+        rows = (flight.as_row() for flight in flights)
+        keys = set()
+        with self.conn:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self.conn.executemany(sql, batch)
+                keys.update(tuple(row[i] for i in _KEY_POSITIONS) for row in batch)
+        return len(keys)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,195 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+# Rove miles earned per $1 spent on each brand's gift card
+GIFT_CARD_RATES = {
+    'giftcards.com': 4, 'visa gift card': 4, 'mastercard gift card': 4, 'airbnb gift card': 4,
+    'doordash gift card': 4, 'uber gift card': 4, 'uber eats gift card': 4, 'starbucks gift card': 4,
+    'target gift card': 1.3, 'cvs gift card': 4, 'giant eagle gift card': 4, 'fanatics gift card': 4,
+    'melting pot gift card': 4, 'thirdlove gift card': 4, 'tops friendly markets gift card': 4,
+    'jtv gift card': 4, 'zappos gift card': 4, "claire's gift card": 4, "famous dave's gift card": 4,
+    'on the border gift card': 4, 'circle k gift card': 4, "fazoli's gift card": 4,
+    'boxlunch gift card': 4, 'bonefish grill gift card': 4, "mcdonald's gift card": 4,
+    'turo gift card': 4, 'golfnow gift card': 4, 'chewy gift card': 4, 'siriusxm gift card': 4,
+    'l.l. bean gift card': 4, 'carnival cruises gift card': 0.6, 'best buy gift card': 0.6,
+    'alamo drafthouse cinemas gift card': 4, 'quince gift card': 4, "mcalister's deli gift card": 4,
+    'emagine theaters gift card': 4, "friendly's gift card": 4, "cheddar's scratch kitchen gift card": 4,
+    'dazn gift card': 4, "dave & buster's gift card": 4, "ruth's chris steak house gift card": 4,
+    'fogo de chao gift card': 4, "morton's steakhouse gift card": 4, 'pacsun gift card': 4,
+    'the container store gift card': 4, 'uno pizzeria & grill gift card': 4, "bj's restaurants gift card": 4,
+    "logan's roadhouse gift card": 4, 'bob evans gift card': 4, 'lorna jane gift card': 4,
+    'lane bryant gift card': 4, 'guess gift card': 4, 'shutterfly gift card': 4,
+    'bubba gump gift card': 4, 'ace hardware gift card': 4, 'quiznos gift card': 4,
+    'thredup gift card': 4, 'hopper gift card': 4, 'tommy bahama gift card': 4,
+    "carrabba's italian grill gift card": 4, 'sweetfrog gift card': 4, 'qdoba gift card': 4,
+    "dick's sporting goods gift card": 1.3, 'american airlines gift card': 1.3,
+    "dunkin' gift card": 1.3, 'zara gift card': 1.3, 'apple gift card': 1.3, 'nike gift card': 0.6,
+    'chuck e. cheese gift card': 4, 'pandora gift card': 4, "bloomingdale's gift card": 4,
+    'belk gift card': 4, 'athleta gift card': 4, 'barnes & noble gift card': 4,
+    'virgin experience gifts gift card': 4, 'jcpenney gift card': 4, 'spafinder gift card': 4,
+    'build-a-bear gift card': 4, 'california pizza kitchen gift card': 4, 'ruby tuesday gift card': 4,
+    'smoothie king gift card': 4, 'old navy gift card': 4, 'aerie gift card': 4,
+    'advance auto parts gift card': 4, 'tillys gift card': 4, 'guitar center gift card': 4,
+    'vudu gift card': 4, 'topgolf gift card': 4, 'the coffee bean & tea leaf gift card': 4,
+    'white house black market gift card': 4, 'wawa gift card': 4, 'dollar shave club gift card': 4,
+    'untuckit gift card': 4, 'torrid gift card': 4, 'pep boys gift card': 4,
+    'famous footwear gift card': 4, 'jiffy lube gift card': 4, 'cold stone creamery gift card': 4,
+    'sling tv gift card': 4, 'buffalo wild wings gift card': 4, "auntie anne's gift card": 4,
+    'cinnabon gift card': 4, 'kfc gift card': 4, "bass pro shops / cabela's gift card": 4,
+    'gap gift card': 4, 'hotels.com gift card': 4, 'disney gift card': 4, 'american girl gift card': 4,
+    "carter's / oshkosh b'gosh gift card": 4, 'eddie bauer gift card': 4, "chico's gift card": 4,
+    'poshmark gift card': 4, 'oura ring gift card': 4, 'american eagle gift card': 4,
+    'aeropostale gift card': 4, 'hollister gift card': 4, 'abercrombie & fitch gift card': 4,
+    'twitch gift card': 4, 'crutchfield gift card': 4, 'lulus gift card': 4, "lands' end gift card": 4,
+    'michaels gift card': 4, "kirkland's gift card": 4, 'h&m gift card': 4, 'hulu gift card': 4,
+    'meijer gift card': 4, 'crate & barrel gift card': 4, 'firebirds wood fired grill gift card': 4,
+    'red robin gift card': 4, 'ihop gift card': 4, 'krispy kreme gift card': 4,
+    'outback steakhouse gift card': 4, 'olive garden gift card': 4, 'speedway gift card': 4,
+    'shell gift card': 4, 'sonic drive-in gift card': 4, 'texas roadhouse gift card': 4,
+    'subway gift card': 4, 'red lobster gift card': 4, 'papa johns gift card': 4,
+    'panda express gift card': 4, 'meta quest gift card': 4, "macy's gift card": 4,
+    "jersey mike's gift card": 4, 'taco bell gift card': 4, 'five guys gift card': 4,
+    "chili's gift card": 4, 'burger king gift card': 4, 'rei gift card': 4, 'marshalls gift card': 4,
+    'homegoods gift card': 4, 'lego gift card': 4, 'gamestop gift card': 4,
+    'academy sports + outdoors gift card': 4, 'roblox gift card': 4, 'nordstrom gift card': 4,
+    'chipotle gift card': 4, 'the home depot gift card': 4, 'wayfair gift card': 4,
+    "victoria's secret gift card": 4, 'tire discounters gift card': 4, 'dsw gift card': 4,
+    'stop & shop gift card': 4, 'nintendo eshop gift card': 4, 'the cheesecake factory gift card': 4,
+    'nordstrom rack gift card': 4, 'petsmart gift card': 4, 'tj maxx gift card': 4,
+    'lululemon gift card': 4, 'spotify gift card': 4, 'lyft gift card': 4, "domino's gift card": 4,
+    'southwest airlines gift card': 4, 'sony playstation gift card': 4, 'microsoft xbox gift card': 4,
+    'autozone gift card': 4, 'saks off 5th gift card': 4, 'adidas gift card': 4,
+    'ulta beauty gift card': 4, 'bath & body works gift card': 4, 'amtrak gift card': 4,
+    'petco gift card': 4, 'saks fifth avenue gift card': 4, 'total wine & more gift card': 4,
+    'instacart gift card': 4, 'google play gift card': 4, 'regal cinemas gift card': 4,
+    'bp amoco gift card': 4, 'grubhub gift card': 4, 'panera bread gift card': 4,
+    "kohl's gift card": 4, 'cinemark gift card': 4, 'delta air lines gift card': 4,
+    'netflix gift card': 4, 'ikea gift card': 4, 'fandango gift card': 4, "lowe's gift card": 4,
+    'sephora gift card': 4, "applebee's gift card": 4, 'amc theatres gift card': 4,
+    'gift card outlets': 0.9
+}
+
+_SUFFIX = ' gift card'
+
+
+def normalize_brand(name: str) -> str:
+    """Lowercase, drop accents and apostrophes, turn other punctuation into spaces."""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"['’]", '', text)
+    return re.sub(r'[^a-z0-9]+', ' ', text).strip()
+
+
+def _short_key(name: str) -> str:
+    key = normalize_brand(name)
+    return key[:-len(_SUFFIX)] if key.endswith(_SUFFIX) else key
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class GiftCardCatalog:
+    """Gift-card brands and their earn rates, with precomputed lookup indexes.
+
+    Brand names are keyed without punctuation and without the trailing
+    "gift card", so "Target", "target gift card" and "TARGET GIFT CARD" all
+    match. ``search`` returns prefix matches (of the name or of any word in
+    it) followed by typo-tolerant matches ranked by trigram overlap.
+    """
+
+    def __init__(self, rates: Dict[str, float], min_similarity: float = 0.3):
+        self.rates = dict(rates)
+        self.brands = list(self.rates)
+        self.min_similarity = min_similarity
+        self._keys = [_short_key(brand) for brand in self.brands]
+        self._exact: Dict[str, int] = {}
+        for brand_id, (brand, key) in enumerate(zip(self.brands, self._keys)):
+            self._exact.setdefault(key, brand_id)
+            self._exact.setdefault(normalize_brand(brand), brand_id)
+        # Sorted (name, id) and (name from its 2nd/3rd/... word, id) lists for prefix lookups
+        self._names = sorted((key, brand_id) for brand_id, key in enumerate(self._keys))
+        self._word_starts = sorted(
+            (key[match.end():], brand_id)
+            for brand_id, key in enumerate(self._keys)
+            for match in re.finditer(' ', key)
+        )
+        self._grams = [_trigrams(key) for key in self._keys]
+        self._postings: Dict[str, List[int]] = {}
+        for brand_id, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(brand_id)
+
+    def __len__(self) -> int:
+        return len(self.brands)
+
+    def __contains__(self, name: str) -> bool:
+        return _short_key(name) in self._exact
+
+    def rate(self, brand: str) -> Optional[float]:
+        brand_id = self._exact.get(_short_key(brand))
+        return self.rates[self.brands[brand_id]] if brand_id is not None else None
+
+    def _prefix_ids(self, key: str, names: List[Tuple[str, int]]) -> List[int]:
+        ids = []
+        position = bisect_left(names, (key, -1))
+        while position < len(names) and names[position][0].startswith(key):
+            ids.append(names[position][1])
+            position += 1
+        return ids
+
+    def _similar(self, key: str) -> List[Tuple[float, int]]:
+        grams = _trigrams(key)
+        shared = Counter(brand_id for gram in grams for brand_id in self._postings.get(gram, ()))
+        scored = []
+        for brand_id, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._grams[brand_id]))
+            if score >= self.min_similarity:
+                scored.append((score, brand_id))
+        scored.sort(key=lambda item: (-item[0], self._keys[item[1]]))
+        return scored
+
+    def lookup(self, name: str, min_similarity: float = 0.6) -> Optional[str]:
+        """The brand ``name`` refers to: an exact match, a unique prefix, else the closest spelling."""
+        key = _short_key(name)
+        if not key:
+            return None
+        brand_id = self._exact.get(key)
+        if brand_id is None:
+            # A prefix that only one brand has, e.g. "xbox" or "depot"
+            prefixed = set(self._prefix_ids(key, self._names) + self._prefix_ids(key, self._word_starts))
+            if len(prefixed) == 1:
+                return self.brands[prefixed.pop()]
+            similar = self._similar(key)
+            if not similar or similar[0][0] < min_similarity:
+                return None
+            brand_id = similar[0][1]
+        return self.brands[brand_id]
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Autocomplete: brands whose name or a word in it starts with ``query``, then near misses."""
+        key = _short_key(query) or normalize_brand(query)
+        if not key:
+            return []
+        results: List[int] = []
+        seen = set()
+        candidates = self._prefix_ids(key, self._names) + self._prefix_ids(key, self._word_starts)
+        candidates += [brand_id for _, brand_id in self._similar(key)]
+        for brand_id in candidates:
+            if brand_id not in seen:
+                seen.add(brand_id)
+                results.append(brand_id)
+                if len(results) >= limit:
+                    break
+        return [self.brands[brand_id] for brand_id in results]
+
+
+@lru_cache(maxsize=1)
+def get_gift_card_catalog() -> GiftCardCatalog:
+    """Process-wide GiftCardCatalog, built on first use."""
+    return GiftCardCatalog(GIFT_CARD_RATES)
@@ -0,0 +1,63 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+
+class GiftCardRateIndex:
+    """Gift-card brands ordered by miles per dollar, best value first.
+
+    Redeeming a balance for a brand's card is worth ``100 / rate`` cents per
+    mile whatever the balance, and a brand is worth offering once the card
+    would be worth ``min_value`` dollars, i.e. from ``min_value * rate`` miles.
+    Sorting by rate makes both the CPMs descending and those thresholds
+    ascending, so the brands a balance qualifies for are a prefix found by
+    binary search, its top-k is the head of that prefix, and prefix sums give
+    the CPM total of any prefix. Brands with equal rates keep catalog order.
+    """
+
+    def __init__(self, rates: Dict[str, float], min_value: float = 25):
+        ordered = sorted(rates.items(), key=lambda item: item[1])
+        self.min_value = min_value
+        self.brands = [brand for brand, _ in ordered]
+        self.rates = [rate for _, rate in ordered]
+        self.thresholds = [min_value * rate for rate in self.rates]
+        self.cpms = [100 / rate for rate in self.rates]
+        self._negative_cpms = [-cpm for cpm in self.cpms]
+        self._cpm_prefix = list(accumulate(self.cpms, initial=0.0))
+
+    def __len__(self) -> int:
+        return len(self.brands)
+
+    def eligible_count(self, user_miles: float) -> int:
+        """Number of leading brands whose card would be worth at least ``min_value``."""
+        count = bisect_right(self.thresholds, user_miles)
+        # Settle the boundary with the same division the per-brand check uses
+        while count < len(self.rates) and user_miles / self.rates[count] >= self.min_value:
+            count += 1
+        while count and user_miles / self.rates[count - 1] < self.min_value:
+            count -= 1
+        return count
+
+    def count_with_cpm(self, min_cpm: float) -> int:
+        """Number of leading brands worth at least ``min_cpm`` cents per mile.
+
+        Errs by rounding error towards including a brand; callers comparing
+        the exact option CPM make the final call.
+        """
+        return bisect_right(self._negative_cpms, -min_cpm + 1e-9)
+
+    def cpm_total(self, count: int) -> float:
+        """Sum of the CPMs of the first ``count`` brands."""
+        return self._cpm_prefix[count]
+
+    def entries(self, start: int = 0, stop: int = None) -> List[Tuple[str, float]]:
+        return list(zip(self.brands[start:stop], self.rates[start:stop]))
+
+    def top(self, user_miles: float, k: int = None, min_cpm: float = None) -> List[Tuple[str, float]]:
+        """The best ``k`` (brand, rate) pairs a balance qualifies for."""
+        count = self.eligible_count(user_miles)
+        if min_cpm is not None:
+            count = min(count, self.count_with_cpm(min_cpm))
+        if k is not None:
+            count = min(count, k)
+        return self.entries(0, count)
@@ -0,0 +1,157 @@
+import csv
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'airports.csv')
+
+# Common spellings that don't match the city column of the bundled data
+CITY_ALIASES = {
+    'new york city': 'NYC',
+    'nyc': 'NYC',
+    'washington dc': 'WAS',
+    'washington d c': 'WAS',
+    'la': 'LAX',
+    'sf': 'SFO',
+    'saint louis': 'STL',
+    'bombay': 'BOM',
+    'bangalore': 'BLR',
+    'peking': 'BJS',
+    'saigon': 'SGN',
+}
+
+
+class Airport(NamedTuple):
+    iata: str
+    name: str
+    city: str
+    city_code: str
+    country: str
+    region: str
+    latitude: float
+    longitude: float
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+    return text.strip()
+
+
+class LocationIndex:
+    """In-memory airport and city index built from the bundled airport table.
+
+    Airports are keyed by IATA code. A city code (e.g. LON, NYC) resolves to the
+    first airport listed for that city. City names are normalized for exact
+    lookups, and a sorted name list serves prefix lookups by binary search.
+    """
+
+    def __init__(self, airports: Iterable[Airport]):
+        self.airports: Dict[str, Airport] = {}
+        self.cities: Dict[str, Airport] = {}
+        self._city_names: Dict[str, str] = {}
+        for airport in airports:
+            self.airports[airport.iata] = airport
+            self.cities.setdefault(airport.city_code, airport)
+            self._city_names.setdefault(normalize_name(airport.city), airport.city_code)
+        for alias, city_code in CITY_ALIASES.items():
+            if city_code in self.cities:
+                self._city_names.setdefault(alias, city_code)
+        self._sorted_names = sorted(self._city_names)
+
+    @classmethod
+    def load(cls, path: str = DATA_PATH) -> 'LocationIndex':
+        with open(path, newline='', encoding='utf-8') as airports_file:
+            airports = [
+                Airport(
+                    row['iata'], row['name'], row['city'], row['city_code'], row['country'],
+                    row['region'], float(row['latitude']), float(row['longitude'])
+                )
+                for row in csv.DictReader(airports_file)
+            ]
+        return cls(airports)
+
+    def airport(self, code: str) -> Optional[Airport]:
+        """Look up an airport by IATA airport code, or a city's primary airport by city code."""
+        code = (code or '').strip().upper()
+        return self.airports.get(code) or self.cities.get(code)
+
+    def city_code(self, name: str) -> Optional[str]:
+        """Resolve a city name, city code or airport code to an IATA city code."""
+        city_code = self._city_names.get(normalize_name(name))
+        if city_code:
+            return city_code
+        airport = self.airport(name)
+        return airport.city_code if airport else None
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Return up to ``limit`` (city name, city code) pairs whose name starts with ``prefix``."""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        matches = []
+        position = bisect_left(self._sorted_names, key)
+        while position < len(self._sorted_names) and len(matches) < limit:
+            name = self._sorted_names[position]
+            if not name.startswith(key):
+                break
+            city_code = self._city_names[name]
+            matches.append((self.cities[city_code].city, city_code))
+            position += 1
+        return matches
+
+
+@lru_cache(maxsize=1)
+def get_location_index() -> LocationIndex:
+    """Process-wide LocationIndex, loaded on first use."""
+    return LocationIndex.load()
+
+
+# OurAirports countries whose continent code doesn't match the regions used here
+_CENTRAL_AMERICA = {'MX', 'GT', 'BZ', 'SV', 'HN', 'NI', 'CR', 'PA', 'CU', 'JM', 'HT', 'DO', 'PR', 'BS', 'BB',
+                    'TT', 'AG', 'AW', 'CW', 'KY', 'TC', 'VI', 'VG', 'LC', 'GD', 'VC', 'KN', 'DM', 'BQ', 'SX', 'MF'}
+_MIDDLE_EAST = {'AE', 'QA', 'BH', 'KW', 'OM', 'SA', 'YE', 'IL', 'JO', 'LB', 'SY', 'IQ', 'IR', 'PS'}
+_CONTINENT_REGIONS = {'NA': 'north_america', 'SA': 'south_america', 'EU': 'europe', 'AF': 'africa',
+                      'AS': 'asia', 'OC': 'oceania'}
+
+
+def build_airports_csv(ourairports_csv: str, output_path: str = DATA_PATH,
+                       city_codes: Optional[Dict[str, str]] = None):
+    """Regenerate the bundled table from an OurAirports ``airports.csv`` dump.
+
+    Keeps large and medium airports with scheduled service and an IATA code.
+    ``city_codes`` maps airport codes to metropolitan city codes (e.g. LHR -> LON).
+    Airports without an entry keep their own code, or the one already bundled.
+    """
+    if city_codes is None:
+        city_codes = {airport.iata: airport.city_code for airport in get_location_index().airports.values()}
+    rows = []
+    with open(ourairports_csv, newline='', encoding='utf-8') as source:
+        for row in csv.DictReader(source):
+            iata = row.get('iata_code', '').strip()
+            if not iata or row.get('type') not in ('large_airport', 'medium_airport'):
+                continue
+            if row.get('scheduled_service') != 'yes':
+                continue
+            country = row['iso_country']
+            if country in _CENTRAL_AMERICA:
+                region = 'central_america'
+            elif country in _MIDDLE_EAST:
+                region = 'middle_east'
+            elif country in ('TR', 'RU', 'CY'):
+                region = 'europe'
+            else:
+                region = _CONTINENT_REGIONS.get(row['continent'], 'other')
+            rows.append([iata, row['name'], row['municipality'] or row['name'], city_codes.get(iata, iata),
+                         country, region, f"{float(row['latitude_deg']):.4f}", f"{float(row['longitude_deg']):.4f}"])
+    rows.sort(key=lambda r: r[0])
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(Airport._fields)
+        writer.writerows(rows)
+    get_location_index.cache_clear()
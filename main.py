@@ -1,11 +1,23 @@
 import os
+import argparse
+import csv
 import logging
-import sqlite3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import time
+from operator import attrgetter
+from typing import List, Dict, Optional, Iterable, Iterator, Set, Tuple
 import pandas as pd
 from amadeus import Client, ResponseError
+from dotenv import load_dotenv
+from collection_journal import CollectionJournal
+from flight_record import FIELD_NAMES, FlightRecord, parse_clock, parse_day
+from flight_store import FlightStore
+from pipeline import CsvSink, ParquetSink, SqliteSink, run_pipeline
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache, flight_offer_request
+
+load_dotenv()
 
 
 logging.basicConfig(
@@ -15,10 +27,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+AIRLINE_NAMES = {
+    'AA': 'American Airlines', 'DL': 'Delta Air Lines', 'UA': 'United Airlines',
+    'BA': 'British Airways', 'AF': 'Air France', 'LH': 'Lufthansa',
+    'CX': 'Cathay Pacific', 'JL': 'Japan Airlines', 'NH': 'All Nippon Airways',
+    'AC': 'Air Canada', 'WN': 'Southwest Airlines', 'AS': 'Alaska Airlines',
+    'B6': 'JetBlue Airways', 'F9': 'Frontier Airlines', 'NK': 'Spirit Airlines',
+    'G4': 'Allegiant Air'
+}
+
 class FlightDataCollector:
-    def __init__(self):
+    def __init__(self, max_workers: int = 1, rate_limiter: Optional[RateLimiter] = None,
+                 journal: Optional[CollectionJournal] = None, response_cache: Optional[ResponseCache] = None):
         self.amadeus = self._initialize_amadeus_client()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.journal = journal
+        self.response_cache = response_cache
         self.collected_flights = []
+        self.max_workers = max(1, max_workers)
+        self.collection_days = 32
         self.routes = [
             {"origin": "MAD", "destination": "BCN", "route_name": "Madrid to Barcelona"},
             {"origin": "JFK", "destination": "LAX", "route_name": "New York to Los Angeles"},
@@ -27,21 +54,31 @@ class FlightDataCollector:
         ]
     
     def _initialize_amadeus_client(self) -> Client:
-        amadeus_api_key = st.secrets["AMADEUS_API_KEY"]
-        amadeus_api_secret = st.secrets["AMADEUS_API_SECRET"]
+        api_key = os.getenv('AMADEUS_API_KEY')
+        api_secret = os.getenv('AMADEUS_API_SECRET')
         if not api_key or not api_secret:
             raise ValueError("Amadeus API credentials not found in environment variables")
         return Client(client_id=api_key, client_secret=api_secret)
     
     def search_flights(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = ResponseCache.make_key('flight-offers', flight_offer_request(origin, destination, departure_date))
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Cache hit for {origin} to {destination} on {departure_date}")
+                return cached
         try:
-            response = self.amadeus.shopping.flight_offers_search.get(
+            response = self.rate_limiter.call(
+                self.amadeus.shopping.flight_offers_search.get,
                 originLocationCode=origin,
                 destinationLocationCode=destination,
                 departureDate=departure_date,
                 adults=1,
                 max=50
             )
+            if cache_key is not None:
+                self.response_cache.set(cache_key, response.data)
             return response.data
         except ResponseError as error:
             logger.error(f"Amadeus API error for {origin} to {destination} on {departure_date}: {error}")
@@ -52,77 +89,142 @@ class FlightDataCollector:
             print(f"Unexpected error: {error}")
             raise SystemExit("Stopping program due to unexpected error.")
     
-    def parse_flight_data(self, flight_offers: List[Dict], route_name: str, origin: str, destination: str) -> List[Dict]:
-        parsed_flights = []
-        airline_codes = {
-            'AA': 'American Airlines', 'DL': 'Delta Air Lines', 'UA': 'United Airlines',
-            'BA': 'British Airways', 'AF': 'Air France', 'LH': 'Lufthansa',
-            'CX': 'Cathay Pacific', 'JL': 'Japan Airlines', 'NH': 'All Nippon Airways',
-            'AC': 'Air Canada', 'WN': 'Southwest Airlines', 'AS': 'Alaska Airlines',
-            'B6': 'JetBlue Airways', 'F9': 'Frontier Airlines', 'NK': 'Spirit Airlines',
-            'G4': 'Allegiant Air'
-        }
-        
+    def parse_flight_data(self, flight_offers: List[Dict], route_name: str, origin: str, destination: str) -> List[FlightRecord]:
+        return list(self.iter_flight_data(flight_offers, route_name, origin, destination))
+    
+    def iter_flight_data(self, flight_offers: Iterable[Dict], route_name: str, origin: str, destination: str) -> Iterator[FlightRecord]:
+        collected_at = datetime.now().isoformat()
         for offer in flight_offers:
             try:
                 itinerary = offer['itineraries'][0]
                 segments = itinerary['segments']
                 first_segment = segments[0]
                 last_segment = segments[-1]
+                departure_at = first_segment['departure']['at']
+                arrival_at = last_segment['arrival']['at']
+                carrier_code = first_segment['carrierCode']
                 
-                flight_data = {
-                    'route_name': route_name,
-                    'origin': first_segment['departure']['iataCode'],
-                    'destination': last_segment['arrival']['iataCode'],
-                    'departure_date': first_segment['departure']['at'][:10],
-                    'arrival_date': last_segment['arrival']['at'][:10],
-                    'departure_time': first_segment['departure']['at'][11:19],
-                    'arrival_time': last_segment['arrival']['at'][11:19],
-                    'airline_code': first_segment['carrierCode'],
-                    'airline_name': airline_codes.get(first_segment['carrierCode'], first_segment['carrierCode']),
-                    'flight_number': f"{first_segment['carrierCode']}{first_segment['number']}",
-                    'aircraft_code': first_segment.get('aircraft', {}).get('code', 'N/A'),
-                    'price_amount': float(offer['price']['total']),
-                    'price_currency': offer['price']['currency'],
-                    'duration': itinerary['duration'],
-                    'stops': len(segments) - 1,
-                    'booking_class': first_segment.get('cabin', 'N/A'),
-                    'seats_available': first_segment.get('numberOfBookableSeats', 0),
-                    'collected_at': datetime.now().isoformat()
-                }
-                parsed_flights.append(flight_data)
+                flight = FlightRecord(
+                    route_name=route_name,
+                    origin=first_segment['departure']['iataCode'],
+                    destination=last_segment['arrival']['iataCode'],
+                    departure_day=parse_day(departure_at[:10]),
+                    arrival_day=parse_day(arrival_at[:10]),
+                    departure_seconds=parse_clock(departure_at[11:19]),
+                    arrival_seconds=parse_clock(arrival_at[11:19]),
+                    airline_code=carrier_code,
+                    airline_name=AIRLINE_NAMES.get(carrier_code, carrier_code),
+                    flight_number=f"{carrier_code}{first_segment['number']}",
+                    aircraft_code=first_segment.get('aircraft', {}).get('code', 'N/A'),
+                    price_amount=float(offer['price']['total']),
+                    price_currency=offer['price']['currency'],
+                    duration=itinerary['duration'],
+                    stops=len(segments) - 1,
+                    booking_class=first_segment.get('cabin', 'N/A'),
+                    seats_available=first_segment.get('numberOfBookableSeats', 0),
+                    collected_at=collected_at
+                )
             except (KeyError, IndexError, ValueError) as e:
                 logger.warning(f"Error parsing flight offer: {e}")
                 continue
-        return parsed_flights
+            yield flight
     
-    def collect_flight_data(self, start_date: Optional[str] = None):
-        start_dt = datetime.strptime('2025-08-01', '%Y-%m-%d')
-        logger.info(f"Starting flight data collection for 32 days from 2025-08-01 to 2025-09-01")
+    def _collection_units(self, start_date: Optional[str] = None) -> Iterator[Tuple[Dict, str]]:
+        start_dt = datetime.strptime(start_date or '2025-08-01', '%Y-%m-%d')
         for route in self.routes:
-            logger.info(f"Collecting data for route: {route['route_name']}")
-            for day_offset in range(32):
-                current_date = start_dt + timedelta(days=day_offset)
-                date_str = current_date.strftime('%Y-%m-%d')
-                logger.info(f"Searching flights for {route['origin']} to {route['destination']} on {date_str}")
-                flight_offers = self.search_flights(route['origin'], route['destination'], date_str)
-                if flight_offers:
-                    parsed_flights = self.parse_flight_data(
-                        flight_offers, route['route_name'], route['origin'], route['destination']
-                    )
-                    self.collected_flights.extend(parsed_flights)
-                    logger.info(f"Collected {len(parsed_flights)} flights for {date_str}")
-                time.sleep(1)
-            logger.info(f"Route {route['route_name']}: {len([f for f in self.collected_flights if f['route_name'] == route['route_name']])} flights collected")
-            time.sleep(2)
+            for day_offset in range(self.collection_days):
+                yield route, (start_dt + timedelta(days=day_offset)).strftime('%Y-%m-%d')
+    
+    def _collect_unit(self, route: Dict, date_str: str) -> List[FlightRecord]:
+        logger.info(f"Searching flights for {route['origin']} to {route['destination']} on {date_str}")
+        flight_offers = self.search_flights(route['origin'], route['destination'], date_str)
+        if not flight_offers:
+            return []
+        return self.parse_flight_data(flight_offers, route['route_name'], route['origin'], route['destination'])
+    
+    def _iter_unit_results(self, units: Iterable[Tuple[Dict, str]], max_workers: int,
+                           completed: Set[Tuple[str, str, str]] = frozenset()) -> Iterator[Tuple[Dict, str, Optional[List[FlightRecord]]]]:
+        if max_workers <= 1:
+            for route, date_str in units:
+                if (route['origin'], route['destination'], date_str) in completed:
+                    yield route, date_str, None
+                else:
+                    yield route, date_str, self._collect_unit(route, date_str)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='flight-search')
+        pending = deque()
+        try:
+            for route, date_str in units:
+                if (route['origin'], route['destination'], date_str) in completed:
+                    pending.append((route, date_str, None))
+                else:
+                    pending.append((route, date_str, executor.submit(self._collect_unit, route, date_str)))
+                if len(pending) >= max_workers * 2:
+                    route, date_str, future = pending.popleft()
+                    yield route, date_str, future.result() if future else None
+            while pending:
+                route, date_str, future = pending.popleft()
+                yield route, date_str, future.result() if future else None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _iter_collected_units(self, start_date: Optional[str] = None, max_workers: Optional[int] = None,
+                              resume: bool = False) -> Iterator[Tuple[Dict, str, List[FlightRecord]]]:
+        max_workers = max(1, max_workers or self.max_workers)
+        start_dt = datetime.strptime(start_date or '2025-08-01', '%Y-%m-%d')
+        end_dt = start_dt + timedelta(days=self.collection_days - 1)
+        logger.info(f"Starting flight data collection for {self.collection_days} days from "
+                    f"{start_dt:%Y-%m-%d} to {end_dt:%Y-%m-%d} with {max_workers} worker(s)")
+        completed = set()
+        if self.journal is not None:
+            if resume:
+                completed = self.journal.completed_units()
+                logger.info(f"Resuming collection: {len(completed)} route/date units already checkpointed")
+            else:
+                self.journal.reset()
+        route_counts = {route['route_name']: 0 for route in self.routes}
+        units = self._collection_units(start_dt.strftime('%Y-%m-%d'))
+        for route, date_str, parsed_flights in self._iter_unit_results(units, max_workers, completed):
+            if parsed_flights is None:
+                restored = self.journal.load(route['origin'], route['destination'], date_str)
+                parsed_flights = [FlightRecord.from_dict(flight) for flight in restored]
+                logger.info(f"Restored {len(parsed_flights)} flights for {route['route_name']} on {date_str} from checkpoint")
+            else:
+                if self.journal is not None:
+                    self.journal.record(route['origin'], route['destination'], date_str,
+                                        [flight.as_dict() for flight in parsed_flights])
+                logger.info(f"Collected {len(parsed_flights)} flights for {route['route_name']} on {date_str}")
+            route_counts[route['route_name']] += len(parsed_flights)
+            yield route, date_str, parsed_flights
+        for route_name, count in route_counts.items():
+            logger.info(f"Route {route_name}: {count} flights collected")
+    
+    def collect_flight_data(self, start_date: Optional[str] = None, max_workers: Optional[int] = None,
+                            resume: bool = False):
+        for _, _, parsed_flights in self._iter_collected_units(start_date, max_workers, resume):
+            self.collected_flights.extend(parsed_flights)
         logger.info(f"Data collection completed. Total flights collected: {len(self.collected_flights)}")
     
+    def iter_collected_flights(self, start_date: Optional[str] = None, max_workers: Optional[int] = None,
+                               resume: bool = False) -> Iterator[FlightRecord]:
+        for _, _, parsed_flights in self._iter_collected_units(start_date, max_workers, resume):
+            yield from parsed_flights
+    
+    def stream_flight_data(self, sinks: List, start_date: Optional[str] = None, max_workers: Optional[int] = None,
+                           resume: bool = False, batch_size: int = 500) -> int:
+        flights = self.iter_collected_flights(start_date, max_workers, resume)
+        total = run_pipeline(flights, sinks, batch_size)
+        logger.info(f"Data collection completed. Total flights streamed: {total}")
+        return total
+    
     def get_statistics(self):
         if not self.collected_flights:
             print("No flight data to display statistics for.")
             return
         
-        df = pd.DataFrame(self.collected_flights)
+        columns = ('route_name', 'price_currency', 'airline_name', 'price_amount')
+        df = pd.DataFrame({name: [getattr(flight, name) for flight in self.collected_flights] for name in columns})
         
         route_stats = df.groupby(['route_name', 'price_currency']).agg({
             'price_amount': ['count', 'min', 'max', 'mean']
@@ -144,22 +246,69 @@ class FlightDataCollector:
             print("No flight data to export.")
             return None
         
-        df = pd.DataFrame(self.collected_flights)
-        df = df.sort_values(['departure_date', 'route_name'])
-        df.to_csv(filename, index=False)
+        flights = sorted(self.collected_flights, key=attrgetter('departure_day', 'route_name'))
+        with open(filename, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(FIELD_NAMES)
+            writer.writerows(flight.as_row() for flight in flights)
         logger.info(f"Flight data exported to {filename}")
 
         return filename
+    
+    def export_to_parquet(self, root: str = "flight_data_parquet", skip_existing: bool = False):
+        if not self.collected_flights:
+            print("No flight data to export.")
+            return None
+        
+        # skip_existing: a resumed run restores offers an earlier run may already have archived
+        written = ParquetSink(root, skip_existing=skip_existing).write_batch(self.collected_flights)
+        logger.info(f"Appended {written} flights to Parquet archive {root}")
+        
+        return root
+
+def export_to_sql(flights: Iterable[FlightRecord], db_path: str = "database.db") -> int:
+    store = FlightStore(db_path)
+    try:
+        written = store.upsert(flights)
+    finally:
+        store.close()
+    logger.info(f"Upserted {written} flights into {db_path}")
+    return written
 
-def export_to_sql(filename):
-    df = pd.read_csv(filename)
-    conn = sqlite3.connect("database.db")
-    df.to_sql("flight_data_sql", conn, if_exists="replace", index=False)
-    conn.close()
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Collect flight data from the Amadeus API for the predefined routes.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of concurrent flight searches (default: 1, serial)")
+    parser.add_argument("--rps", type=float, default=10.0,
+                        help="Amadeus requests per second budget (default: 10)")
+    parser.add_argument("--burst", type=int, default=1,
+                        help="number of requests allowed back to back before throttling (default: 1)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip route/date units completed by a previous interrupted run")
+    parser.add_argument("--stream", action="store_true",
+                        help="write offers to the CSV and SQLite outputs in batches as they arrive instead of holding them in memory")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="number of offers per streamed write batch (default: 500)")
+    parser.add_argument("--parquet", metavar="DIR",
+                        help="also append offers to a Parquet archive partitioned by route and departure month")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="seconds a cached flight search stays fresh (default: 3600)")
+    parser.add_argument("--cache-size", type=int, default=1000,
+                        help="maximum number of cached flight searches kept on disk (default: 1000)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always call the API instead of reusing cached searches")
+    parser.add_argument("--journal", default="collection_journal.db",
+                        help="path of the SQLite checkpoint journal (default: collection_journal.db)")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
     try:
-        collector = FlightDataCollector()
+        rate_limiter = RateLimiter(requests_per_second=args.rps, burst=args.burst)
+        journal = CollectionJournal(args.journal)
+        response_cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl, max_entries=args.cache_size)
+        collector = FlightDataCollector(max_workers=args.workers, rate_limiter=rate_limiter, journal=journal,
+                                        response_cache=response_cache)
         
         print("=== HUVTSP ROVE Flight Data Collector ===")
         print("This script will collect flight data from Amadeus API for predefined routes.")
@@ -167,16 +316,29 @@ def main():
         for i, route in enumerate(collector.routes, 1):
             print(f"{i}. {route['route_name']} ({route['origin']} → {route['destination']})")
         
-        response = input(f"\nDo you want to start collecting flight data for the next 32 days? (y/n): ")
+        response = input(f"\nDo you want to start collecting flight data for the next {collector.collection_days} days? (y/n): ")
+        
+        if response.lower() in ['y', 'yes'] and args.stream:
+            sinks = [CsvSink("flight_data_export.csv"), SqliteSink("database.db")]
+            if args.parquet:
+                sinks.append(ParquetSink(args.parquet, skip_existing=args.resume))
+            total = collector.stream_flight_data(sinks, resume=args.resume, batch_size=args.batch_size)
+            if response_cache is not None:
+                logger.info(f"Response cache: {response_cache.stats()}")
+            print(f"\nStreamed {total} flights to flight_data_export.csv and database.db")
         
-        if response.lower() in ['y', 'yes']:
-            collector.collect_flight_data()
+        elif response.lower() in ['y', 'yes']:
+            collector.collect_flight_data(resume=args.resume)
+            if response_cache is not None:
+                logger.info(f"Response cache: {response_cache.stats()}")
             collector.get_statistics()
             csv_file = collector.export_to_csv()
             if csv_file:
-                export_to_sql(csv_file)
                 print(f"\nData has been exported to: {csv_file}")
-            print("\nData has been exported to SQL file.")
+                export_to_sql(collector.collected_flights)
+                print("\nData has been exported to SQL file.")
+            if args.parquet and collector.export_to_parquet(args.parquet, skip_existing=args.resume):
+                print(f"\nData has been appended to Parquet archive: {args.parquet}")
             
         else:
             print("Data collection cancelled.")
@@ -191,6 +353,11 @@ def main():
         print("1. Copy your API key and secret from Amadeus for Developers")
         print("2. Replace 'your_amadeus_api_key_here' and 'your_amadeus_api_secret_here' in .env file")
     
+    except SystemExit:
+        logger.error(f"Collection stopped early. Completed searches are checkpointed in {args.journal}; "
+                     f"run again with --resume to fetch only the missing ones.")
+        raise
+    
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         print(f"An error occurred: {e}")
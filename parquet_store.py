@@ -0,0 +1,153 @@
+import os
+import uuid
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from flight_record import FlightRecord, format_day
+
+PARTITION_SCHEMA = pa.schema([
+    ('route_name', pa.string()),
+    ('departure_month', pa.string()),
+])
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+FLIGHT_SCHEMA = pa.schema([
+    ('route_name', pa.string()),
+    ('origin', CATEGORY),
+    ('destination', CATEGORY),
+    ('departure_date', pa.date32()),
+    ('arrival_date', pa.date32()),
+    ('departure_time', pa.time32('s')),
+    ('arrival_time', pa.time32('s')),
+    ('airline_code', CATEGORY),
+    ('airline_name', CATEGORY),
+    ('flight_number', pa.string()),
+    ('aircraft_code', CATEGORY),
+    ('price_amount', pa.float64()),
+    ('price_currency', CATEGORY),
+    ('duration', pa.string()),
+    ('stops', pa.int8()),
+    ('booking_class', CATEGORY),
+    ('seats_available', pa.int16()),
+    ('collected_at', pa.timestamp('us')),
+    ('departure_month', pa.string()),
+])
+
+# date32 counts days from 1970-01-01; FlightRecord stores proleptic ordinals
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Identifies one collected offer across runs; offers restored from the journal keep their collected_at
+OFFER_KEY = ('collected_at', 'flight_number', 'departure_date', 'departure_time', 'booking_class', 'price_amount')
+
+
+def offer_key(flight: FlightRecord) -> Tuple:
+    return (flight.collected_at, flight.flight_number, flight.departure_date, flight.departure_time,
+            flight.booking_class, flight.price_amount)
+
+
+def flights_to_table(flights: List[FlightRecord]) -> pa.Table:
+    """Build a typed Arrow table straight from FlightRecord fields."""
+    collected_at = {}
+    for flight in flights:
+        if flight.collected_at not in collected_at:
+            collected_at[flight.collected_at] = datetime.fromisoformat(flight.collected_at) if flight.collected_at else None
+
+    def values(name: str) -> list:
+        return [getattr(flight, name) for flight in flights]
+
+    def category(name: str) -> pa.Array:
+        return pa.array(values(name), type=pa.string()).dictionary_encode()
+
+    def days(name: str) -> pa.Array:
+        return pa.array([day - EPOCH_ORDINAL for day in values(name)], type=pa.int32()).cast(pa.date32())
+
+    def seconds(name: str) -> pa.Array:
+        return pa.array(values(name), type=pa.int32()).cast(pa.time32('s'))
+
+    columns = {
+        'route_name': pa.array(values('route_name'), type=pa.string()),
+        'origin': category('origin'),
+        'destination': category('destination'),
+        'departure_date': days('departure_day'),
+        'arrival_date': days('arrival_day'),
+        'departure_time': seconds('departure_seconds'),
+        'arrival_time': seconds('arrival_seconds'),
+        'airline_code': category('airline_code'),
+        'airline_name': category('airline_name'),
+        'flight_number': pa.array(values('flight_number'), type=pa.string()),
+        'aircraft_code': category('aircraft_code'),
+        'price_amount': pa.array(values('price_amount'), type=pa.float64()),
+        'price_currency': category('price_currency'),
+        'duration': pa.array(values('duration'), type=pa.string()),
+        'stops': pa.array(values('stops'), type=pa.int8()),
+        'booking_class': category('booking_class'),
+        'seats_available': pa.array(values('seats_available'), type=pa.int16()),
+        'collected_at': pa.array([collected_at[flight.collected_at] for flight in flights], type=pa.timestamp('us')),
+        'departure_month': pa.array([format_day(day)[:7] for day in values('departure_day')], type=pa.string()),
+    }
+    return pa.table(columns, schema=FLIGHT_SCHEMA)
+
+
+class ParquetFlightStore:
+    """Columnar flight archive partitioned by route and departure month.
+
+    Every append writes new files into the affected ``route_name=/departure_month=``
+    directories and never rewrites existing ones. Reads filtered on those keys
+    only open the matching partitions.
+    """
+
+    def __init__(self, root: str = "flight_data_parquet", compression: str = "zstd"):
+        self.root = root
+        self.compression = compression
+        self.partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+    def append(self, flights: List[FlightRecord]) -> int:
+        if not flights:
+            return 0
+        table = flights_to_table(flights)
+        write_options = ds.ParquetFileFormat().make_write_options(compression=self.compression)
+        run_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        ds.write_dataset(
+            table,
+            self.root,
+            format='parquet',
+            partitioning=self.partitioning,
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=write_options,
+        )
+        return table.num_rows
+
+    def archived_offers(self, route_name: str, departure_month: str) -> Counter:
+        """How many times each offer (``offer_key``) is already stored in one partition."""
+        if not os.path.isdir(self.root):
+            return Counter()
+        table = self.read(route_name, departure_month, columns=list(OFFER_KEY))
+        collected_at, flight_number, departure_date, departure_time, booking_class, price_amount = (
+            table.column(name).to_pylist() for name in OFFER_KEY
+        )
+        return Counter(
+            (stamp.isoformat() if stamp is not None else '', number, day.isoformat(), clock.isoformat(), cabin, price)
+            for stamp, number, day, clock, cabin, price in zip(
+                collected_at, flight_number, departure_date, departure_time, booking_class, price_amount
+            )
+        )
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format='parquet', partitioning=self.partitioning)
+
+    def read(self, route_name: Optional[str] = None, departure_month: Optional[str] = None,
+             columns: Optional[List[str]] = None) -> pa.Table:
+        """Read the archive, pruning partitions by route and/or month (``YYYY-MM``)."""
+        condition = None
+        if route_name is not None:
+            condition = ds.field('route_name') == route_name
+        if departure_month is not None:
+            month_condition = ds.field('departure_month') == departure_month
+            condition = month_condition if condition is None else condition & month_condition
+        return self.dataset().to_table(columns=columns, filter=condition)
@@ -0,0 +1,102 @@
+import csv
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from flight_record import FIELD_NAMES, FlightRecord
+from flight_store import FlightStore
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of at most ``size`` items from ``items``."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class CsvSink:
+    """Append flight offers to a CSV file as they are collected.
+
+    Rows are written in collection order (route, then date) rather than the
+    sorted order produced by FlightDataCollector.export_to_csv.
+    """
+
+    def __init__(self, filename: str = "flight_data_export.csv", append: bool = False):
+        self.filename = filename
+        self._file = open(filename, 'a' if append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(FIELD_NAMES)
+
+    def write_batch(self, flights: List[FlightRecord]):
+        self._writer.writerows(flight.as_row() for flight in flights)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteSink:
+    """Upsert flight offers into the SQLite flight table one batch at a time."""
+
+    def __init__(self, db_path: str = "database.db", store: Optional[FlightStore] = None):
+        self.store = store or FlightStore(db_path)
+
+    def write_batch(self, flights: List[FlightRecord]):
+        self.store.upsert(flights)
+
+    def close(self):
+        self.store.close()
+
+
+class ParquetSink:
+    """Append each batch of flight offers to the partitioned Parquet archive.
+
+    The archive is append-only, so a resumed run would add the offers it
+    restores from the journal a second time. With ``skip_existing`` each
+    offer already stored in its partition (as many times as it is stored)
+    is skipped, including a unit that was only partly appended before the
+    interruption.
+    """
+
+    def __init__(self, root: str = "flight_data_parquet", skip_existing: bool = False):
+        from parquet_store import ParquetFlightStore
+        self.store = ParquetFlightStore(root)
+        self._archived = {} if skip_existing else None
+
+    def _already_archived(self, flight: FlightRecord) -> bool:
+        from parquet_store import offer_key
+        partition = (flight.route_name, flight.departure_date[:7])
+        if partition not in self._archived:
+            # Loaded before this run writes to the partition, so only earlier runs count
+            self._archived[partition] = self.store.archived_offers(*partition)
+        archived = self._archived[partition]
+        key = offer_key(flight)
+        if archived[key] > 0:
+            archived[key] -= 1
+            return True
+        return False
+
+    def write_batch(self, flights: List[FlightRecord]) -> int:
+        if self._archived is not None:
+            flights = [flight for flight in flights if not self._already_archived(flight)]
+        return self.store.append(flights)
+
+    def close(self):
+        pass
+
+
+def run_pipeline(flights: Iterable[FlightRecord], sinks: List, batch_size: int = 500) -> int:
+    """Drain ``flights`` into every sink in fixed-size batches and return the row count."""
+    written = 0
+    try:
+        for batch in batched(flights, batch_size):
+            for sink in sinks:
+                sink.write_batch(batch)
+            written += len(batch)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return written
@@ -0,0 +1,158 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from rate_limiter import RateLimiter
+
+
+class OfferProvider(ABC):
+    """Source of flight and hotel offers for RedemptionOptimizer.
+
+    Flight offers are dicts with price, currency, airline, duration and cabin.
+    Hotel offers are dicts with name, price, currency, rating, category and chain.
+    """
+
+    is_mock = False
+
+    @abstractmethod
+    def flight_offers(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def hotel_offers(self, city_code: str, check_in_date: str, check_out_date: str) -> List[Dict]:
+        ...
+
+
+class AmadeusOfferProvider(OfferProvider):
+    """Live offers from the Amadeus flight-offers and hotel-offers APIs."""
+
+    def __init__(self, client, rate_limiter: Optional[RateLimiter] = None, max_flights: int = 10,
+                 max_hotels: int = 20, hotels_to_check: int = 10):
+        self.amadeus = client
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_flights = max_flights
+        self.max_hotels = max_hotels
+        self.hotels_to_check = hotels_to_check
+
+    def flight_offers(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
+        response = self.rate_limiter.call(
+            self.amadeus.shopping.flight_offers_search.get,
+            originLocationCode=origin,
+            destinationLocationCode=destination,
+            departureDate=departure_date,
+            adults=1,
+            max=self.max_flights
+        )
+        flights = []
+        for offer in response.data:
+            flights.append({
+                'price': float(offer['price']['total']),
+                'currency': offer['price']['currency'],
+                'airline': offer['itineraries'][0]['segments'][0]['carrierCode'],
+                'duration': offer['itineraries'][0]['duration'],
+                'cabin': offer['travelerPricings'][0]['fareDetailsBySegment'][0].get('cabin', 'ECONOMY')
+            })
+        return flights
+
+    def hotel_offers(self, city_code: str, check_in_date: str, check_out_date: str) -> List[Dict]:
+        hotels_response = self.rate_limiter.call(
+            self.amadeus.reference_data.locations.hotels.by_city.get,
+            cityCode=city_code
+        )
+        hotels = []
+        for hotel in (hotels_response.data or [])[:self.hotels_to_check]:
+            hotel_id = hotel.get('hotelId')
+            if not hotel_id:
+                continue
+            try:
+                offers_response = self.rate_limiter.call(
+                    self.amadeus.shopping.hotel_offers_search.get,
+                    hotelIds=hotel_id,
+                    checkInDate=check_in_date,
+                    checkOutDate=check_out_date,
+                    adults=1
+                )
+            except Exception:
+                continue
+            for offer in offers_response.data or []:
+                hotel_info = offer.get('hotel', {})
+                price = offer.get('offers', [{}])[0].get('price', {})
+                rating = float(hotel_info.get('rating', 0) or 0)
+                hotels.append({
+                    'name': hotel_info.get('name', 'Unknown'),
+                    'price': float(price.get('total', 0)),
+                    'currency': price.get('currency', 'USD'),
+                    'rating': rating,
+                    'category': self.category_for_rating(rating),
+                    'chain': hotel_info.get('chainCode', 'Independent')
+                })
+                if len(hotels) >= self.max_hotels:
+                    return hotels
+        return hotels
+
+    @staticmethod
+    def category_for_rating(rating: float) -> str:
+        if rating >= 4.5:
+            return 'luxury'
+        elif rating >= 4.0:
+            return 'upscale'
+        elif rating >= 3.0:
+            return 'mid_scale'
+        return 'economy'
+
+
+class MockOfferProvider(OfferProvider):
+    """Deterministic offline offers mirroring the Amadeus response structure.
+
+    The same request always returns the same sample. ``latency_profile`` is an
+    optional ``(min_seconds, max_seconds)`` range slept before each call; it
+    is off by default so tests and demos only pay for real work. For example,
+    ``(20, 25)`` reproduces the delay the optimizer used to simulate.
+    """
+
+    is_mock = True
+
+    FLIGHT_OFFERS = [
+        {"price": 189.0, "currency": "USD", "airline": "DL", "duration": "PT6H10M", "cabin": "ECONOMY"},
+        {"price": 249.0, "currency": "USD", "airline": "AA", "duration": "PT6H05M", "cabin": "ECONOMY"},
+        {"price": 312.0, "currency": "USD", "airline": "UA", "duration": "PT6H15M", "cabin": "ECONOMY"},
+        {"price": 275.0, "currency": "USD", "airline": "B6", "duration": "PT5H55M", "cabin": "ECONOMY"},
+        {"price": 329.0, "currency": "USD", "airline": "AS", "duration": "PT6H20M", "cabin": "ECONOMY"},
+        {"price": 512.0, "currency": "USD", "airline": "DL", "duration": "PT6H10M", "cabin": "BUSINESS"},
+        {"price": 689.0, "currency": "USD", "airline": "AA", "duration": "PT6H05M", "cabin": "BUSINESS"},
+        {"price": 799.0, "currency": "USD", "airline": "UA", "duration": "PT6H00M", "cabin": "FIRST"},
+        {"price": 945.0, "currency": "USD", "airline": "B6", "duration": "PT5H55M", "cabin": "FIRST"},
+        {"price": 1125.0, "currency": "USD", "airline": "AS", "duration": "PT6H20M", "cabin": "FIRST"},
+    ]
+
+    HOTEL_OFFERS = [
+        {"name": "Holiday Inn Express", "price": 89.0, "currency": "USD", "rating": 3.2, "category": "economy", "chain": "IHG"},
+        {"name": "Comfort Inn & Suites", "price": 112.0, "currency": "USD", "rating": 3.5, "category": "economy", "chain": "CHOICE"},
+        {"name": "Hampton Inn", "price": 135.0, "currency": "USD", "rating": 3.8, "category": "mid_scale", "chain": "HILTON"},
+        {"name": "Courtyard by Marriott", "price": 189.0, "currency": "USD", "rating": 4.1, "category": "mid_scale", "chain": "MARRIOTT"},
+        {"name": "Hilton Garden Inn", "price": 225.0, "currency": "USD", "rating": 4.3, "category": "upscale", "chain": "HILTON"},
+        {"name": "Embassy Suites", "price": 289.0, "currency": "USD", "rating": 4.4, "category": "upscale", "chain": "HILTON"},
+        {"name": "Renaissance Hotel", "price": 345.0, "currency": "USD", "rating": 4.6, "category": "luxury", "chain": "MARRIOTT"},
+        {"name": "W Hotel", "price": 425.0, "currency": "USD", "rating": 4.7, "category": "luxury", "chain": "MARRIOTT"},
+        {"name": "The Ritz-Carlton", "price": 589.0, "currency": "USD", "rating": 4.9, "category": "luxury", "chain": "MARRIOTT"},
+        {"name": "Four Seasons Hotel", "price": 725.0, "currency": "USD", "rating": 4.9, "category": "luxury", "chain": "FOUR_SEASONS"},
+    ]
+
+    def __init__(self, sample_size: int = 3, seed: int = 0, latency_profile: Optional[Tuple[float, float]] = None):
+        self.sample_size = sample_size
+        self.seed = seed
+        self.latency_profile = latency_profile
+
+    def _sample(self, offers: List[Dict], *request: str) -> List[Dict]:
+        rng = random.Random(f"{self.seed}|{'|'.join(request)}")
+        if self.latency_profile:
+            time.sleep(rng.uniform(*self.latency_profile))
+        chosen = rng.sample(offers, min(self.sample_size, len(offers)))
+        return [dict(offer) for offer in chosen]
+
+    def flight_offers(self, origin: str, destination: str, departure_date: str) -> List[Dict]:
+        return self._sample(self.FLIGHT_OFFERS, 'flights', origin, destination, departure_date)
+
+    def hotel_offers(self, city_code: str, check_in_date: str, check_out_date: str) -> List[Dict]:
+        return self._sample(self.HOTEL_OFFERS, 'hotels', city_code, check_in_date, check_out_date)
@@ -0,0 +1,91 @@
+import heapq
+from itertools import count
+from typing import Dict, Iterable, List, Optional
+
+
+class TopKRanker:
+    """Keep the ``k`` highest-CPM options per category as they are produced.
+
+    Filters are applied before an option enters the heap, so the top-k is
+    already correct for them:
+    - ``min_cpm``: drop options below this CPM
+    - ``max_miles``: drop options needing more miles than this
+    - ``cabin``: keep only flights in this cabin (other categories are unaffected)
+    - ``categories``: rank only these categories
+
+    Each category holds a min-heap of at most ``k`` entries, so adding n options
+    costs O(n log k). ``k=None`` keeps every accepted option. Equal CPMs keep
+    the option that was added first, matching a stable descending sort.
+    """
+
+    def __init__(self, k: Optional[int] = 3, min_cpm: float = None, max_miles: float = None,
+                 cabin: str = None, categories: Iterable[str] = None):
+        self.k = k
+        self.min_cpm = min_cpm
+        self.max_miles = max_miles
+        self.cabin = cabin.upper() if cabin else None
+        self.categories = set(categories) if categories is not None else None
+        self.options_seen = 0
+        self.cpm_total = 0.0
+        self._heaps: Dict[str, List] = {}
+        self._sequence = count()
+
+    def wants(self, category: str) -> bool:
+        return self.categories is None or category in self.categories
+
+    def accepts(self, category: str, option: Dict) -> bool:
+        if not self.wants(category):
+            return False
+        if self.min_cpm is not None and option['cpm'] < self.min_cpm:
+            return False
+        if self.max_miles is not None and option['miles_required'] > self.max_miles:
+            return False
+        if self.cabin and option.get('type') == 'flight':
+            if str(option.get('details', {}).get('cabin', '')).upper() != self.cabin:
+                return False
+        return True
+
+    def record(self, count: int, cpm_total: float):
+        """Count options that were scored but never built, for ``average_cpm``."""
+        self.options_seen += count
+        self.cpm_total += cpm_total
+
+    def add(self, category: str, option: Dict, record: bool = True) -> bool:
+        """Offer one option; returns True if it is currently in the category's top-k."""
+        heap = self._heaps.setdefault(category, [])
+        if record:
+            self.record(1, option['cpm'])
+        if (self.k is not None and self.k <= 0) or not self.accepts(category, option):
+            return False
+        # Later options sort lower on ties, so they are evicted first
+        entry = (option['cpm'], -next(self._sequence), option)
+        if self.k is None or len(heap) < self.k:
+            heapq.heappush(heap, entry)
+            return True
+        if entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+            return True
+        return False
+
+    def extend(self, category: str, options: Iterable[Dict]):
+        for option in options:
+            self.add(category, option)
+
+    def top(self, category: str) -> List[Dict]:
+        """The category's top-k, best first."""
+        return [entry[2] for entry in sorted(self._heaps.get(category, []), key=lambda e: e[:2], reverse=True)]
+
+    def best(self) -> Optional[Dict]:
+        """Best option across categories; ties go to the category added first."""
+        best = None
+        for heap in self._heaps.values():
+            if heap:
+                candidate = max(heap, key=lambda e: e[:2])[2]
+                if best is None or candidate['cpm'] > best['cpm']:
+                    best = candidate
+        return best
+
+    @property
+    def average_cpm(self) -> float:
+        """Average CPM of every option offered, before filtering."""
+        return self.cpm_total / self.options_seen if self.options_seen else 0
@@ -0,0 +1,121 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """Return the HTTP status code carried by an Amadeus ResponseError, if any."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Return the Retry-After delay in seconds from an error response, if present."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = None
+    for name, header_value in dict(headers).items():
+        if name.lower() == 'retry-after':
+            value = header_value
+            break
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Thread-safe token bucket for Amadeus API calls.
+
+    Tokens refill at ``requests_per_second`` up to ``burst``. ``call`` retries
+    429 and 5xx responses with jittered exponential backoff, never waiting less
+    than the server's Retry-After. A 429 pauses every caller sharing the bucket.
+    """
+
+    def __init__(self, requests_per_second: float = 10.0, burst: int = 1, max_retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.requests_per_second)
+        self._updated_at = now
+
+    def acquire(self):
+        """Block until a request token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.requests_per_second
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens to every caller for ``seconds``."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated_at = max(self._updated_at, self._paused_until)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(ceiling / 2, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``func`` under the rate limit, retrying throttled and server errors."""
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                status_code = get_status_code(error)
+                if status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, get_retry_after(error))
+                attempt += 1
+                logger.warning(f"HTTP {status_code} from Amadeus, retrying in {delay:.2f}s "
+                               f"(attempt {attempt}/{self.max_retries})")
+                if status_code == 429:
+                    self.pause(delay)
+                else:
+                    time.sleep(delay)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional
+
+
+def flight_offer_request(origin: str, destination: str, departure_date: str, adults: int = 1,
+                         max_results: int = 50) -> Dict:
+    """Normalized flight-offers search parameters used as a cache key."""
+    return {
+        'origin': origin.strip().upper(),
+        'destination': destination.strip().upper(),
+        'departure_date': date.fromisoformat(str(departure_date).strip()).isoformat(),
+        'adults': int(adults),
+        'max': int(max_results),
+    }
+
+
+def redemption_search_request(user_miles: int, origin: str = None, destination: str = None,
+                              departure_date: str = None, city_name: str = None, check_in_date: str = None,
+                              check_out_date: str = None, **options) -> Dict:
+    """Normalized optimize_redemption parameters used as a cache key.
+
+    Codes are uppercased, city names lowercased with whitespace collapsed, and
+    ``options`` (filters such as min_cpm or max_miles) kept only when set.
+    """
+    def code(value):
+        return value.strip().upper() if value else None
+
+    def day(value):
+        return date.fromisoformat(str(value).strip()).isoformat() if value else None
+
+    return {
+        'user_miles': int(user_miles),
+        'origin': code(origin),
+        'destination': code(destination),
+        'departure_date': day(departure_date),
+        'city_name': ' '.join(city_name.lower().split()) if city_name else None,
+        'check_in_date': day(check_in_date),
+        'check_out_date': day(check_out_date),
+        'options': {name: value for name, value in sorted(options.items()) if value is not None},
+    }
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry and an LRU size cap.
+
+    Entries expire ``ttl`` seconds after being set. Once more than
+    ``max_entries`` are held, the least recently used are dropped.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache for API responses.
+
+    Entries are JSON files named after the SHA-256 of the normalized request.
+    They expire ``ttl`` seconds after being written. Once more than
+    ``max_entries`` files exist, the least recently used ones are evicted.
+    """
+
+    def __init__(self, directory: str = ".flight_cache", ttl: float = 3600, max_entries: int = 1000):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                path = os.path.join(directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), name[:-5]))
+                except OSError:
+                    continue
+        # Least recently used first; a hit moves the key to the end
+        self._index = OrderedDict((key, None) for _, key in sorted(entries))
+
+    @staticmethod
+    def make_key(kind: str, request: Dict) -> str:
+        payload = json.dumps({'kind': kind, 'request': request}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _discard(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            entry = None
+        with self._lock:
+            if entry is None or time.time() - entry.get('stored_at', 0) > self.ttl:
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._index[key] = None
+            self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['value']
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump({'stored_at': time.time(), 'value': value}, cache_file)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._index[key] = None
+            self._index.move_to_end(key)
+            while len(self._index) > self.max_entries:
+                oldest = next(iter(self._index))
+                self._discard(oldest)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index):
+                self._discard(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._index)}
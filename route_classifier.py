@@ -0,0 +1,149 @@
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from locations import LocationIndex, get_location_index
+
+if TYPE_CHECKING:
+    import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Anything this short prices on the short-haul chart wherever it flies
+SHORT_HAUL_MAX_MILES = 700
+# Cross-border hops inside one region (e.g. within Europe or Asia) up to this distance are short haul too
+REGIONAL_MAX_MILES = 2000
+
+_LEGACY_US_AIRPORTS = {'JFK', 'LAX', 'ORD', 'DFW', 'ATL', 'SFO', 'BOS', 'SEA', 'DCA', 'IAD'}
+
+
+def great_circle_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in statute miles."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def great_circle_path(lat1: float, lon1: float, lat2: float, lon2: float, segments: int = 32) -> List[Tuple[float, float]]:
+    """Points along the great circle between two coordinates, for drawing routes.
+
+    Longitudes are unwrapped (they may leave [-180, 180]) so a route across
+    the antimeridian draws as one continuous line.
+    """
+    phi1, lambda1, phi2, lambda2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    start = (math.cos(phi1) * math.cos(lambda1), math.cos(phi1) * math.sin(lambda1), math.sin(phi1))
+    end = (math.cos(phi2) * math.cos(lambda2), math.cos(phi2) * math.sin(lambda2), math.sin(phi2))
+    angle = math.acos(max(-1.0, min(1.0, sum(a * b for a, b in zip(start, end)))))
+    if angle < 1e-9:
+        return [(lat1, lon1), (lat2, lon2)]
+    points = []
+    previous_lon = None
+    for step in range(segments + 1):
+        t = step / segments
+        a = math.sin((1 - t) * angle) / math.sin(angle)
+        b = math.sin(t * angle) / math.sin(angle)
+        x, y, z = (a * s + b * e for s, e in zip(start, end))
+        lat = math.degrees(math.atan2(z, math.hypot(x, y)))
+        lon = math.degrees(math.atan2(y, x))
+        if previous_lon is not None:
+            lon += 360 * round((previous_lon - lon) / 360)
+        points.append((lat, lon))
+        previous_lon = lon
+    return points
+
+
+def legacy_route_type(origin: str, destination: str) -> str:
+    """The original hardcoded US-list rule, used for airports missing from the index."""
+    if origin in _LEGACY_US_AIRPORTS and destination in _LEGACY_US_AIRPORTS:
+        if origin in ['JFK', 'BOS'] and destination in ['DCA', 'IAD']:
+            return 'short_haul'
+        return 'domestic'
+    elif (origin in _LEGACY_US_AIRPORTS) != (destination in _LEGACY_US_AIRPORTS):
+        return 'international'
+    return 'short_haul'
+
+
+class RouteClassifier:
+    """Classify routes as short_haul, domestic or international for award pricing.
+
+    Rules, in order:
+    - 700 miles or less: short_haul
+    - same country: domestic
+    - same region and 2000 miles or less: short_haul
+    - otherwise: international
+
+    Coordinates, countries and regions come from the bundled airport index.
+    City codes such as LON resolve to the city's primary airport.
+    """
+
+    def __init__(self, locations: Optional[LocationIndex] = None, cache_size: int = 4096):
+        self.locations = locations or get_location_index()
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+        self.path = lru_cache(maxsize=cache_size)(self._path)
+
+    def distance(self, origin: str, destination: str) -> Optional[float]:
+        start = self.locations.airport(origin)
+        end = self.locations.airport(destination)
+        if start is None or end is None:
+            return None
+        return great_circle_miles(start.latitude, start.longitude, end.latitude, end.longitude)
+
+    def _path(self, origin: str, destination: str) -> Optional[Tuple[Tuple[float, float], ...]]:
+        """Great-circle polyline for a route, or None if either airport is unknown."""
+        start = self.locations.airport(origin)
+        end = self.locations.airport(destination)
+        if start is None or end is None:
+            return None
+        return tuple(great_circle_path(start.latitude, start.longitude, end.latitude, end.longitude))
+
+    def _classify(self, origin: str, destination: str) -> str:
+        start = self.locations.airport(origin)
+        end = self.locations.airport(destination)
+        if start is None or end is None:
+            return legacy_route_type(origin, destination)
+        distance = great_circle_miles(start.latitude, start.longitude, end.latitude, end.longitude)
+        if distance <= SHORT_HAUL_MAX_MILES:
+            return 'short_haul'
+        if start.country == end.country:
+            return 'domestic'
+        if start.region == end.region and distance <= REGIONAL_MAX_MILES:
+            return 'short_haul'
+        return 'international'
+
+    def classify_many(self, origins: Sequence[str], destinations: Sequence[str]) -> 'np.ndarray':
+        """Vectorized ``classify`` over equal-length sequences of airport codes."""
+        import numpy as np
+
+        origins = np.asarray(origins, dtype=str)
+        destinations = np.asarray(destinations, dtype=str)
+        count = len(origins)
+        codes, inverse = np.unique(np.concatenate([origins, destinations]), return_inverse=True)
+        airports = [self.locations.airport(code) for code in codes]
+        known = np.array([airport is not None for airport in airports], dtype=bool)
+        latitude = np.radians([airport.latitude if airport else 0.0 for airport in airports])
+        longitude = np.radians([airport.longitude if airport else 0.0 for airport in airports])
+        country = np.array([airport.country if airport else '' for airport in airports], dtype=object)
+        region = np.array([airport.region if airport else '' for airport in airports], dtype=object)
+
+        start, end = inverse[:count], inverse[count:]
+        a = (np.sin((latitude[end] - latitude[start]) / 2) ** 2
+             + np.cos(latitude[start]) * np.cos(latitude[end]) * np.sin((longitude[end] - longitude[start]) / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+        route_types = np.select(
+            [
+                distance <= SHORT_HAUL_MAX_MILES,
+                country[start] == country[end],
+                (region[start] == region[end]) & (distance <= REGIONAL_MAX_MILES),
+            ],
+            ['short_haul', 'domestic', 'short_haul'],
+            default='international',
+        ).astype(object)
+
+        unknown = ~(known[start] & known[end])
+        if unknown.any():
+            for position in np.flatnonzero(unknown):
+                route_types[position] = legacy_route_type(origins[position], destinations[position])
+        return route_types
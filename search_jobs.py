@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+FILTER_NAMES = ('min_cpm', 'max_miles', 'cabin', 'categories', 'top_k')
+
+
+class SearchJob:
+    """One redemption search running in the background.
+
+    Each category (flights, hotels, gift cards) is its own task on the shared
+    executor. ``snapshot`` ranks whatever has finished so far, so a caller can
+    show gift cards as soon as they are ready and fill in flights and hotels
+    later. ``cancel`` stops waiting: queued categories never start and late
+    results are discarded.
+    """
+
+    def __init__(self, optimizer, executor: Executor, category_timeout: float = None, **search):
+        self.optimizer = optimizer
+        self.category_timeout = category_timeout
+        self.filters = {name: search.pop(name) for name in FILTER_NAMES if name in search}
+        self.search = search
+        self.user_input = optimizer.search_input(**search)
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.results: Dict[str, List[Dict]] = {}
+        self.errors: Dict[str, str] = {}
+        self.timed_out: List[str] = []
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        tasks = optimizer.search_tasks(**search, **self.filters)
+        self._futures: Dict[str, Future] = {}
+        for name, task in tasks.items():
+            self._futures[name] = executor.submit(task)
+        # Registered once every future exists, so a fast category can't look like the last one
+        for name, future in self._futures.items():
+            future.add_done_callback(lambda f, name=name: self._finish(name, f))
+
+    def _finish(self, name: str, future: Future):
+        with self._lock:
+            if self._cancelled.is_set() or name in self.timed_out:
+                return
+            try:
+                self.results[name] = future.result()
+            except CancelledError:
+                return
+            except Exception as e:
+                self.errors[name] = str(e)
+                self.results[name] = []
+            if len(self.results) + len(self.timed_out) == len(self._futures):
+                self.finished_at = time.monotonic()
+
+    def _expire(self):
+        # Give up on categories that have run past the timeout
+        if self.category_timeout is None or self.finished_at is not None:
+            return
+        if time.monotonic() - self.started_at < self.category_timeout:
+            return
+        with self._lock:
+            for name, future in self._futures.items():
+                if name not in self.results and name not in self.timed_out:
+                    future.cancel()
+                    self.timed_out.append(name)
+            if self.finished_at is None:
+                self.finished_at = time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        self._expire()
+        return self.cancelled or self.finished_at is not None
+
+    @property
+    def pending(self) -> List[str]:
+        self._expire()
+        with self._lock:
+            return [name for name in self._futures if name not in self.results and name not in self.timed_out]
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def cancel(self):
+        self._cancelled.set()
+        for future in self._futures.values():
+            future.cancel()
+        with self._lock:
+            if self.finished_at is None:
+                self.finished_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        """An optimize_redemption-style result built from the categories finished so far.
+
+        Adds ``pending_categories`` (still running) and ``category_errors``.
+        Unfinished, timed-out and cancelled categories are listed in
+        ``incomplete_categories``.
+        """
+        pending = self.pending
+        with self._lock:
+            results = dict(self.results)
+            incomplete = list(self.timed_out) + [name for name in self._futures if name not in results
+                                                  and name not in self.timed_out]
+            errors = dict(self.errors)
+        result = self.optimizer.search_result(
+            self.search['user_miles'], self.user_input, results, incomplete, **self.filters
+        )
+        result['pending_categories'] = [] if self.cancelled else pending
+        result['category_errors'] = errors
+        return result
+
+    def wait(self, timeout: float = None, poll_interval: float = 0.05) -> Dict:
+        """Block until the job is done (or ``timeout`` passes) and return a snapshot."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done and (deadline is None or time.monotonic() < deadline):
+            time.sleep(poll_interval)
+        return self.snapshot()
+
+
+def make_search_executor(max_workers: int = 8) -> ThreadPoolExecutor:
+    """Executor shared by every SearchJob; one search uses up to three workers."""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-job')